@@ -1,7 +1,7 @@
 from django import forms
 from django.forms import inlineformset_factory
 from .models import (
-    RawMaterial, DailyConsumption, ProductType, DailyProduction,
+    RawMaterial, DailyConsumption, ProductType, RecipeComponent, DailyProduction,
     Customer, PurchaseOrder, PurchaseOrderItem, PurchaseOrderUpdate
 )
 
@@ -70,6 +70,33 @@ class ProductTypeForm(forms.ModelForm):
         }
 
 
+class RecipeComponentForm(forms.ModelForm):
+    """Form for one raw material in a product's recipe"""
+
+    class Meta:
+        model = RecipeComponent
+        fields = ['raw_material', 'quantity_per_unit']
+        widgets = {
+            'raw_material': forms.Select(attrs={'class': 'form-select'}),
+            'quantity_per_unit': forms.NumberInput(attrs={
+                'class': 'form-input',
+                'step': '0.0001',
+                'min': '0',
+                'placeholder': 'Per unit'
+            }),
+        }
+
+
+# Formset for inline editing of a product's recipe
+RecipeComponentFormSet = inlineformset_factory(
+    ProductType,
+    RecipeComponent,
+    form=RecipeComponentForm,
+    extra=3,
+    can_delete=True
+)
+
+
 class DailyProductionForm(forms.ModelForm):
     """Form for recording daily production output"""
 
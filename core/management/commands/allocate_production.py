@@ -0,0 +1,42 @@
+"""
+Management command to allocate recorded production to open order items.
+
+Production is allocated oldest order first as it is recorded and as orders
+are created; run this to reconcile a whole day at once, e.g. after importing
+production or re-opening orders.
+
+Usage:
+    python manage.py allocate_production                      # All unallocated production
+    python manage.py allocate_production --date 2026-01-15    # One day's production
+"""
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.allocation import allocate_production
+
+
+class Command(BaseCommand):
+    help = 'Allocate unallocated production to open order items, oldest order first'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date',
+            help='Only allocate production recorded on this day (YYYY-MM-DD)'
+        )
+
+    def handle(self, *args, **options):
+        day = None
+        if options['date']:
+            try:
+                day = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError(f"Invalid date: {options['date']}")
+
+        result = allocate_production(date=day)
+
+        style = self.style.SUCCESS if result['units'] else self.style.WARNING
+        self.stdout.write(style(
+            f"Allocated {result['units']} unit(s) to {result['items']} item(s) "
+            f"across {result['orders']} order(s)"
+        ))
@@ -0,0 +1,141 @@
+"""
+Management command to EXPLAIN the list and export queries and report index usage.
+
+Run it against production-sized data to confirm the planner still picks the
+indexes from core/migrations/0003_hot_query_indexes.py. Cursor (page 2+)
+queries must also seek into the index rather than scan it from the top.
+
+Usage:
+    python manage.py explain_queries              # One line per query
+    python manage.py explain_queries --verbose    # Include the full plan
+    python manage.py explain_queries --analyze    # EXPLAIN ANALYZE (PostgreSQL only)
+"""
+import re
+import uuid
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from core.models import (
+    RawMaterial, DailyConsumption, ProductType, DailyProduction,
+    Customer, PurchaseOrder
+)
+from core.services.pagination import DEFAULT_PAGE_SIZE, _keyset_filter
+
+# PostgreSQL: "Index Scan", "Index Only Scan", "Bitmap Index Scan"
+# SQLite: "USING INDEX", "USING COVERING INDEX", "USING PRIMARY KEY"
+INDEX_PATTERN = re.compile(r'Index (Only )?Scan|Bitmap Index Scan|USING (COVERING )?INDEX|USING (INTEGER )?PRIMARY KEY', re.I)
+SEQ_SCAN_PATTERN = re.compile(r'Seq Scan|SCAN (TABLE )?\w+$', re.I | re.M)
+# A range condition on the index; "SCAN ... USING INDEX" alone reads it from the top
+# PostgreSQL: "Index Cond", SQLite: "SEARCH ... USING INDEX"
+SEEK_PATTERN = re.compile(r'Index Cond|SEARCH \w+ USING (COVERING )?INDEX', re.I)
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN each list/export query and report whether it uses an index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='Run EXPLAIN ANALYZE (PostgreSQL only; executes the queries)'
+        )
+        parser.add_argument(
+            '--verbose',
+            action='store_true',
+            help='Print the full plan for each query'
+        )
+
+    def get_queries(self):
+        """Querysets shaped like the ones the list and export views run"""
+        today = timezone.now().date()
+        week_ago = today - timedelta(days=7)
+        page = DEFAULT_PAGE_SIZE + 1
+        material = RawMaterial.objects.values_list('id', flat=True).first()
+        product = ProductType.objects.values_list('id', flat=True).first()
+        customer = Customer.objects.values_list('id', flat=True).first()
+
+        consumption = DailyConsumption.objects.select_related('raw_material')
+        production = DailyProduction.objects.select_related('product_type')
+        orders = PurchaseOrder.objects.select_related('customer')
+
+        return [
+            ('consumption_history', consumption.order_by('-date', '-created_at', '-id')[:page]),
+            ('consumption_history date range', consumption.filter(
+                date__gte=week_ago, date__lte=today).order_by('-date', '-created_at', '-id')[:page]),
+            ('consumption_history category', consumption.filter(
+                raw_material__category='meat').order_by('-date', '-created_at', '-id')[:page]),
+            ('consumption by material', DailyConsumption.objects.filter(
+                raw_material_id=material, date__gte=week_ago)),
+            ('export_consumption', consumption.order_by('-date')),
+            ('production_history', production.order_by('-date', '-created_at', '-id')[:page]),
+            ('production_history product', production.filter(
+                product_type_id=product, date__gte=week_ago).order_by('-date', '-created_at', '-id')[:page]),
+            ('export_production', production.order_by('-date')),
+            ('purchase_order_list', orders.order_by('-created_at', '-id')[:page]),
+            ('purchase_order_list status', orders.filter(
+                status='completed').order_by('-created_at', '-id')[:page]),
+            ('purchase_order_list customer', orders.filter(
+                customer_id=customer).order_by('-created_at', '-id')[:page]),
+            ('open orders', PurchaseOrder.objects.filter(
+                status__in=['pending', 'in_progress']).order_by('-created_at', '-id')[:page]),
+            ('export_orders', orders.order_by('-created_at')),
+        ]
+
+    def get_cursor_queries(self):
+        """Second-page queries, with the cursor taken from the last row of the first page"""
+        page = DEFAULT_PAGE_SIZE + 1
+        consumption = DailyConsumption.objects.select_related('raw_material')
+        production = DailyProduction.objects.select_related('product_type')
+        orders = PurchaseOrder.objects.select_related('customer')
+        now = timezone.now()
+
+        def next_page(queryset, keys, fallback):
+            ordering = [f'-{key}' for key in keys]
+            cursor = queryset.order_by(*ordering).values_list(*keys)[DEFAULT_PAGE_SIZE - 1:DEFAULT_PAGE_SIZE].first()
+            return queryset.filter(_keyset_filter(keys, list(cursor or fallback), 'lt')).order_by(*ordering)[:page]
+
+        return [
+            ('consumption_history page 2', next_page(
+                consumption, ('date', 'created_at', 'id'), (now.date(), now, uuid.UUID(int=0)))),
+            ('production_history page 2', next_page(
+                production, ('date', 'created_at', 'id'), (now.date(), now, uuid.UUID(int=0)))),
+            ('purchase_order_list page 2', next_page(
+                orders, ('created_at', 'id'), (now, uuid.UUID(int=0)))),
+        ]
+
+    def handle(self, *args, **options):
+        explain_options = {}
+        if options['analyze']:
+            if connection.vendor != 'postgresql':
+                self.stdout.write(self.style.WARNING('--analyze is only supported on PostgreSQL; ignoring'))
+            else:
+                explain_options['analyze'] = True
+
+        indexed = 0
+        cursor_queries = self.get_cursor_queries()
+        cursor_names = {name for name, _ in cursor_queries}
+        queries = self.get_queries() + cursor_queries
+        for name, queryset in queries:
+            plan = queryset.explain(**explain_options)
+            uses_index = bool(INDEX_PATTERN.search(plan))
+            has_seq_scan = bool(SEQ_SCAN_PATTERN.search(plan))
+            needs_seek = name in cursor_names
+
+            if needs_seek and uses_index and not SEEK_PATTERN.search(plan):
+                status = self.style.WARNING('index scan, no seek')
+            elif uses_index and not has_seq_scan:
+                status = self.style.SUCCESS('index')
+                indexed += 1
+            elif uses_index:
+                status = self.style.WARNING('index + seq scan')
+            else:
+                status = self.style.ERROR('seq scan')
+
+            self.stdout.write(f'{name:<35} {status}')
+            if options['verbose']:
+                for line in plan.splitlines():
+                    self.stdout.write(f'    {line}')
+
+        self.stdout.write(f'\n{indexed}/{len(queries)} queries fully index-backed')
@@ -0,0 +1,51 @@
+"""
+Management command that pre-renders the standard daily, weekly and monthly
+consumption and production reports for the Reports page.
+
+Run it nightly from the web service, which serves the files it writes (see
+docs/DEPLOYMENT.md). Reports whose source data has not changed since the
+last run are skipped.
+
+Usage:
+    python manage.py generate_reports                    # Render changed reports
+    python manage.py generate_reports --force            # Render everything
+    python manage.py generate_reports --date 2026-01-31  # Reports as of another day
+"""
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.reports import generate_reports
+
+
+class Command(BaseCommand):
+    help = 'Pre-render the standard consumption and production reports'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Render every report even if its data is unchanged'
+        )
+        parser.add_argument(
+            '--date',
+            type=str,
+            help='Render reports as if run on this day (YYYY-MM-DD; default: today)'
+        )
+
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            try:
+                today = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError(f"Invalid date: {options['date']}")
+
+        rendered = skipped = 0
+        for file_name, was_rendered in generate_reports(today=today, force=options['force']):
+            if was_rendered:
+                rendered += 1
+                self.stdout.write(f'   ├─ Rendered {file_name}')
+            else:
+                skipped += 1
+
+        self.stdout.write(self.style.SUCCESS(f'{rendered} report(s) rendered, {skipped} unchanged'))
@@ -0,0 +1,48 @@
+"""
+Management command to recompute the DailyMaterialUsage rollup from consumption entries.
+
+The rollup is kept in step by DailyConsumption.save()/delete() and its
+queryset's delete(), update() and bulk_create(), but raw SQL and data loaded
+with loaddata bypass those hooks. Run this after such changes, or to backfill.
+
+Usage:
+    python manage.py rebuild_material_usage            # Rebuild the rollup
+    python manage.py rebuild_material_usage --check    # Report drift only
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.models import DailyConsumption, DailyMaterialUsage
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-day, per-material consumption rollup'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report days/materials whose rollup row disagrees with the entries'
+        )
+
+    def handle(self, *args, **options):
+        expected = DailyConsumption.objects.usage_totals()
+        stored = {
+            (day, raw_material_id): (quantity, entries)
+            for day, raw_material_id, quantity, entries in DailyMaterialUsage.objects.values_list(
+                'date', 'raw_material_id', 'total_quantity', 'entry_count'
+            )
+        }
+        drift_count = sum(1 for key in expected.keys() | stored.keys() if expected.get(key) != stored.get(key))
+
+        if options['check']:
+            style = self.style.SUCCESS if drift_count == 0 else self.style.WARNING
+            self.stdout.write(style(f'{drift_count} rollup row(s) out of date'))
+            return
+
+        with transaction.atomic():
+            rebuilt = DailyMaterialUsage.objects.rebuild()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {rebuilt} rollup row(s) ({drift_count} were out of date)'
+        ))
@@ -0,0 +1,48 @@
+"""
+Management command to recompute the stored fulfillment counters on purchase orders.
+
+Counters are kept in step by PurchaseOrderItem.save() and a post_delete
+receiver, but queryset update() and raw SQL bypass those hooks. Run this after
+such changes.
+
+Usage:
+    python manage.py rebuild_order_counters            # Rebuild all orders
+    python manage.py rebuild_order_counters --check    # Report drift only
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Q
+
+from core.models import PurchaseOrder
+
+
+class Command(BaseCommand):
+    help = 'Recompute total_ordered, total_fulfilled and item counts on purchase orders'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report orders whose stored counters disagree with their items'
+        )
+
+    def handle(self, *args, **options):
+        drifted = PurchaseOrder.objects.with_fulfillment().exclude(
+            Q(total_ordered=F('annotated_total_ordered'))
+            & Q(total_fulfilled=F('annotated_total_fulfilled'))
+            & Q(item_count=F('annotated_items_count'))
+            & Q(fulfilled_item_count=F('annotated_items_count') - F('annotated_unfulfilled_count'))
+        )
+        drift_count = drifted.count()
+
+        if options['check']:
+            style = self.style.SUCCESS if drift_count == 0 else self.style.WARNING
+            self.stdout.write(style(f'{drift_count} order(s) with out-of-date counters'))
+            return
+
+        with transaction.atomic():
+            updated = PurchaseOrder.objects.recompute_fulfillment_counters()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Recomputed counters for {updated} order(s) ({drift_count} were out of date)'
+        ))
@@ -0,0 +1,67 @@
+"""
+Management command that processes queued background exports.
+
+Run it as a long-lived process next to gunicorn inside the web service, or
+with --once from a scheduler in that service: the web service serves the
+files it writes, so a separate worker only works if it shares EXPORT_ROOT
+with the web service (see docs/DEPLOYMENT.md).
+
+Usage:
+    python manage.py run_export_worker                  # Poll forever
+    python manage.py run_export_worker --once           # Drain the queue, then exit
+    python manage.py run_export_worker --poll-interval 10
+"""
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.services.export_jobs import claim_next_job, fail_stale_jobs, purge_expired_jobs, run_export_job
+
+
+class Command(BaseCommand):
+    help = 'Process queued background export jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process every queued job, then exit'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=5.0,
+            help='Seconds to wait between queue checks when idle (default: 5)'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('Export worker started'))
+
+        stale = fail_stale_jobs()
+        if stale:
+            self.stdout.write(self.style.WARNING(f'Failed {stale} export(s) left running by a stopped worker'))
+
+        while True:
+            close_old_connections()
+
+            purged = purge_expired_jobs()
+            if purged:
+                self.stdout.write(f'Purged {purged} expired export(s)')
+
+            job = claim_next_job()
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            self.stdout.write(f'Running {job.export_type} ({job.export_format}) export {job.pk}')
+            job = run_export_job(job)
+            if job.status == 'done':
+                self.stdout.write(self.style.SUCCESS(
+                    f'   ├─ {job.rows_processed} rows → {job.file_name} ({job.file_size} bytes)'
+                ))
+            else:
+                self.stdout.write(self.style.ERROR(f'   ├─ Failed: {job.error}'))
+
+        self.stdout.write(self.style.SUCCESS('Export queue empty'))
@@ -0,0 +1,54 @@
+# Generated by Django 6.0 on 2026-10-17 03:26
+
+from django.db import migrations, models
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    PurchaseOrder = apps.get_model('core', 'PurchaseOrder')
+    PurchaseOrderItem = apps.get_model('core', 'PurchaseOrderItem')
+    items = PurchaseOrderItem.objects.filter(purchase_order=OuterRef('pk')).order_by().values('purchase_order')
+
+    def item_aggregate(aggregate):
+        return Coalesce(Subquery(items.annotate(value=aggregate).values('value')), 0)
+
+    PurchaseOrder.objects.update(
+        total_ordered=item_aggregate(Sum('quantity_ordered')),
+        total_fulfilled=item_aggregate(Sum('quantity_fulfilled')),
+        item_count=item_aggregate(Count('id')),
+        fulfilled_item_count=item_aggregate(
+            Count('id', filter=Q(quantity_fulfilled__gte=F('quantity_ordered')))
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='purchaseorder',
+            name='fulfilled_item_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='purchaseorder',
+            name='item_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='purchaseorder',
+            name='total_fulfilled',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='purchaseorder',
+            name='total_ordered',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 6.0 on 2026-10-17 03:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_purchaseorder_fulfillment_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dailyconsumption',
+            index=models.Index(fields=['date', 'created_at', 'id'], name='consumption_date_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dailyconsumption',
+            index=models.Index(fields=['raw_material', 'date'], name='consumption_material_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dailyproduction',
+            index=models.Index(fields=['date', 'created_at', 'id'], name='production_date_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dailyproduction',
+            index=models.Index(fields=['date', 'product_type'], name='production_date_product_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(fields=['status', 'created_at'], name='po_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(fields=['customer', 'created_at'], name='po_customer_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'in_progress'])), fields=['created_at', 'id'], name='po_open_created_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 6.0 on 2026-10-17 04:05
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_usage(apps, schema_editor):
+    DailyConsumption = apps.get_model('core', 'DailyConsumption')
+    DailyMaterialUsage = apps.get_model('core', 'DailyMaterialUsage')
+    rows = DailyConsumption.objects.order_by().values('date', 'raw_material_id').annotate(
+        usage_quantity=Sum('quantity'), usage_entries=Count('id')
+    )
+    DailyMaterialUsage.objects.bulk_create(
+        [
+            DailyMaterialUsage(
+                date=row['date'], raw_material_id=row['raw_material_id'],
+                total_quantity=row['usage_quantity'], entry_count=row['usage_entries'],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_exportjob_parquet_format'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyMaterialUsage',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('total_quantity', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('entry_count', models.IntegerField(default=0)),
+                ('raw_material', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_usage', to='core.rawmaterial')),
+            ],
+            options={
+                'db_table': 'daily_material_usage',
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['raw_material', 'date'], name='material_usage_material_idx')],
+                'constraints': [models.UniqueConstraint(fields=('date', 'raw_material'), name='material_usage_date_material_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_usage, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-17 04:40
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_daily_material_usage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecipeComponent',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('quantity_per_unit', models.DecimalField(decimal_places=4, max_digits=10)),
+                ('product_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recipe', to='core.producttype')),
+                ('raw_material', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recipe_uses', to='core.rawmaterial')),
+            ],
+            options={
+                'db_table': 'recipe_components',
+                'constraints': [models.UniqueConstraint(fields=('product_type', 'raw_material'), name='recipe_product_material_uniq')],
+            },
+        ),
+    ]
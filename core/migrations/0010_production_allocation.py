@@ -0,0 +1,26 @@
+# Generated by Django 6.0 on 2026-10-17 05:10
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def mark_history_allocated(apps, schema_editor):
+    # Production recorded before allocation existed has already left the kitchen
+    DailyProduction = apps.get_model('core', 'DailyProduction')
+    DailyProduction.objects.update(quantity_allocated=F('quantity'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_recipe_components'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyproduction',
+            name='quantity_allocated',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(mark_history_allocated, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-17 15:40
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_purchase_order_created_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='recipecomponent',
+            name='quantity_per_unit',
+            field=models.DecimalField(decimal_places=4, max_digits=10, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-17 16:05
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_recipe_quantity_min'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductionAllocation',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('quantity', models.IntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('order_item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='allocations', to='core.purchaseorderitem')),
+                ('production', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='allocations', to='core.dailyproduction')),
+            ],
+            options={
+                'db_table': 'production_allocations',
+            },
+        ),
+    ]
@@ -1,5 +1,19 @@
 import uuid
-from django.db import models
+from django.conf import settings
+from django.core.validators import MinValueValidator
+from django.db import IntegrityError, models, transaction
+from django.db.models import Case, Count, F, FloatField, Max, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+
+class CustomerQuerySet(models.QuerySet):
+    def with_order_stats(self):
+        """Annotate order count, units ordered and last order date in the same query"""
+        return self.annotate(
+            order_count=Count('purchase_orders'),
+            units_ordered=Coalesce(Sum('purchase_orders__total_ordered'), 0),
+            last_order_at=Max('purchase_orders__created_at'),
+        )
 
 
 class Customer(models.Model):
@@ -7,6 +21,9 @@ class Customer(models.Model):
     name = models.CharField(max_length=255)
     contact_info = models.CharField(max_length=255, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = CustomerQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -27,6 +44,7 @@ class RawMaterial(models.Model):
     name = models.CharField(max_length=255)
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES)
     unit = models.CharField(max_length=50)  # e.g., grams, pieces, heads
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.name} ({self.unit})"
@@ -35,6 +53,60 @@ class RawMaterial(models.Model):
         db_table = 'raw_materials'
 
 
+class DailyConsumptionQuerySet(models.QuerySet):
+    """
+    Bulk writes that keep the DailyMaterialUsage rollup in step, like
+    DailyConsumption.save()/delete() do for single entries.
+    """
+
+    USAGE_FIELDS = {'date', 'raw_material', 'raw_material_id', 'quantity'}
+
+    def usage_totals(self) -> dict:
+        """Summed quantity and entry count per (date, raw_material_id), in one GROUP BY"""
+        rows = self.order_by().values('date', 'raw_material_id').annotate(
+            usage_quantity=Sum('quantity'), usage_entries=Count('id')
+        )
+        return {
+            (row['date'], row['raw_material_id']): (row['usage_quantity'], row['usage_entries'])
+            for row in rows
+        }
+
+    def delete(self):
+        with transaction.atomic():
+            removed = self.usage_totals()
+            result = super().delete()
+            DailyMaterialUsage.objects.apply_deltas({
+                key: (-quantity, -entries) for key, (quantity, entries) in removed.items()
+            })
+        return result
+
+    def update(self, **kwargs):
+        if not self.USAGE_FIELDS & kwargs.keys():
+            return super().update(**kwargs)
+        with transaction.atomic():
+            pks = list(self.values_list('pk', flat=True))
+            before = self.usage_totals()
+            updated = super().update(**kwargs)
+            after = DailyConsumption.objects.filter(pk__in=pks).usage_totals()
+            deltas = {key: (-quantity, -entries) for key, (quantity, entries) in before.items()}
+            for key, (quantity, entries) in after.items():
+                previous_quantity, previous_entries = deltas.get(key, (0, 0))
+                deltas[key] = (previous_quantity + quantity, previous_entries + entries)
+            DailyMaterialUsage.objects.apply_deltas(deltas)
+        return updated
+
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic():
+            created = super().bulk_create(objs, *args, **kwargs)
+            deltas = {}
+            for consumption in created:
+                key = (consumption.date, consumption.raw_material_id)
+                quantity, entries = deltas.get(key, (0, 0))
+                deltas[key] = (quantity + consumption.quantity, entries + 1)
+            DailyMaterialUsage.objects.apply_deltas(deltas)
+        return created
+
+
 class DailyConsumption(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     date = models.DateField()
@@ -42,18 +114,138 @@ class DailyConsumption(models.Model):
     quantity = models.DecimalField(max_digits=10, decimal_places=2)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = DailyConsumptionQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.raw_material.name} - {self.date}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        if {'date', 'raw_material_id', 'quantity'} <= loaded.keys():
+            instance._usage = (loaded['date'], loaded['raw_material_id'], loaded['quantity'])
+        return instance
+
+    def _stored_usage(self):
+        """(date, raw_material_id, quantity) of this entry as currently stored in the database"""
+        if hasattr(self, '_usage'):
+            return self._usage
+        return DailyConsumption.objects.filter(pk=self.pk).values_list('date', 'raw_material_id', 'quantity').first()
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            previous = None if self._state.adding else self._stored_usage()
+            super().save(*args, **kwargs)
+            current = (self.date, self.raw_material_id, self.quantity)
+
+            deltas = {}
+            if previous:
+                deltas[previous[:2]] = (-previous[2], -1)
+            quantity, entries = deltas.get(current[:2], (0, 0))
+            deltas[current[:2]] = (quantity + current[2], entries + 1)
+            DailyMaterialUsage.objects.apply_deltas(deltas)
+            self._usage = current
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            previous = self._stored_usage()
+            result = super().delete(*args, **kwargs)
+            if previous:
+                DailyMaterialUsage.objects.apply_deltas({previous[:2]: (-previous[2], -1)})
+            self.__dict__.pop('_usage', None)
+        return result
+
     class Meta:
         db_table = 'daily_consumptions'
         ordering = ['-date', '-created_at']
+        indexes = [
+            # History list ordering and keyset pagination
+            models.Index(fields=['date', 'created_at', 'id'], name='consumption_date_created_idx'),
+            models.Index(fields=['raw_material', 'date'], name='consumption_material_date_idx'),
+        ]
+
+
+class DailyMaterialUsageQuerySet(models.QuerySet):
+    def apply_deltas(self, deltas: dict):
+        """
+        Add (quantity, entries) deltas to the rollup rows keyed by
+        (date, raw_material_id), creating rows as needed and dropping rows
+        whose entry count reaches zero.
+        """
+        for (day, raw_material_id), (quantity, entries) in deltas.items():
+            if not quantity and not entries:
+                continue
+            key = self.filter(date=day, raw_material_id=raw_material_id)
+            changes = {
+                'total_quantity': F('total_quantity') + quantity,
+                'entry_count': F('entry_count') + entries,
+            }
+            if not key.update(**changes):
+                if entries < 0:
+                    # Nothing to subtract from; `rebuild_material_usage` repairs drift
+                    continue
+                try:
+                    with transaction.atomic():
+                        self.create(
+                            date=day, raw_material_id=raw_material_id,
+                            total_quantity=quantity, entry_count=entries,
+                        )
+                except IntegrityError:
+                    # Another request created the row since the update above
+                    key.update(**changes)
+            if entries < 0:
+                key.filter(entry_count__lte=0).delete()
+
+    def rebuild(self) -> int:
+        """Recompute every rollup row from DailyConsumption; returns the number of rows"""
+        self.all().delete()
+        totals = DailyConsumption.objects.usage_totals()
+        self.bulk_create(
+            [
+                DailyMaterialUsage(
+                    date=day, raw_material_id=raw_material_id, total_quantity=quantity, entry_count=entries
+                )
+                for (day, raw_material_id), (quantity, entries) in totals.items()
+            ],
+            batch_size=1000,
+        )
+        return len(totals)
+
+
+class DailyMaterialUsage(models.Model):
+    """
+    Per-day, per-material rollup of DailyConsumption: one row however many
+    entries the kitchen logs. Maintained by DailyConsumption.save()/delete()
+    and its queryset's bulk writes; `rebuild_material_usage` recomputes it.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    date = models.DateField()
+    raw_material = models.ForeignKey(RawMaterial, on_delete=models.CASCADE, related_name='daily_usage')
+    total_quantity = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    entry_count = models.IntegerField(default=0)
+
+    objects = DailyMaterialUsageQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.raw_material.name} - {self.date}: {self.total_quantity}"
+
+    class Meta:
+        db_table = 'daily_material_usage'
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'raw_material'], name='material_usage_date_material_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['raw_material', 'date'], name='material_usage_material_idx'),
+        ]
 
 
 class ProductType(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=255)  # e.g., "Food Pack", "Platter", "Bilao"
     description = models.TextField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -62,6 +254,23 @@ class ProductType(models.Model):
         db_table = 'product_types'
 
 
+class RecipeComponent(models.Model):
+    """Bill of materials line: how much of a raw material goes into one unit of a product"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    product_type = models.ForeignKey(ProductType, on_delete=models.CASCADE, related_name='recipe')
+    raw_material = models.ForeignKey(RawMaterial, on_delete=models.CASCADE, related_name='recipe_uses')
+    quantity_per_unit = models.DecimalField(max_digits=10, decimal_places=4, validators=[MinValueValidator(0)])
+
+    def __str__(self):
+        return f"{self.product_type.name}: {self.quantity_per_unit} {self.raw_material.unit} {self.raw_material.name}"
+
+    class Meta:
+        db_table = 'recipe_components'
+        constraints = [
+            models.UniqueConstraint(fields=['product_type', 'raw_material'], name='recipe_product_material_uniq'),
+        ]
+
+
 class DailyProduction(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     date = models.DateField()
@@ -70,12 +279,58 @@ class DailyProduction(models.Model):
     contents_description = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Units already assigned to order items by core.services.allocation
+    quantity_allocated = models.IntegerField(default=0, editable=False)
+
     def __str__(self):
         return f"{self.product_type.name} - {self.date}"
 
     class Meta:
         db_table = 'daily_productions'
         ordering = ['-date', '-created_at']
+        indexes = [
+            # History list ordering and keyset pagination
+            models.Index(fields=['date', 'created_at', 'id'], name='production_date_created_idx'),
+            models.Index(fields=['date', 'product_type'], name='production_date_product_idx'),
+        ]
+
+
+class PurchaseOrderQuerySet(models.QuerySet):
+    def with_fulfillment(self):
+        """Annotate item totals and progress computed from the item rows"""
+        return self.annotate(
+            annotated_total_ordered=Coalesce(Sum('items__quantity_ordered'), 0),
+            annotated_total_fulfilled=Coalesce(Sum('items__quantity_fulfilled'), 0),
+            annotated_items_count=Count('items'),
+            annotated_unfulfilled_count=Count(
+                'items', filter=Q(items__quantity_fulfilled__lt=F('items__quantity_ordered'))
+            ),
+        ).annotate(
+            annotated_progress=Case(
+                When(annotated_total_ordered=0, then=Value(0.0)),
+                default=(
+                    F('annotated_total_fulfilled') * Value(100.0)
+                    / F('annotated_total_ordered')
+                ),
+                output_field=FloatField(),
+            ),
+        )
+
+    def recompute_fulfillment_counters(self):
+        """Rebuild the stored fulfillment counters from item rows in one UPDATE"""
+        items = PurchaseOrderItem.objects.filter(purchase_order=OuterRef('pk')).order_by().values('purchase_order')
+
+        def item_aggregate(aggregate):
+            return Coalesce(Subquery(items.annotate(value=aggregate).values('value')), 0)
+
+        return self.update(
+            total_ordered=item_aggregate(Sum('quantity_ordered')),
+            total_fulfilled=item_aggregate(Sum('quantity_fulfilled')),
+            item_count=item_aggregate(Count('id')),
+            fulfilled_item_count=item_aggregate(
+                Count('id', filter=Q(quantity_fulfilled__gte=F('quantity_ordered')))
+            ),
+        )
 
 
 class PurchaseOrder(models.Model):
@@ -86,12 +341,22 @@ class PurchaseOrder(models.Model):
         ('cancelled', 'Cancelled'),
     ]
 
+    COUNTER_FIELDS = ['total_ordered', 'total_fulfilled', 'item_count', 'fulfilled_item_count']
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name='purchase_orders')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Denormalized from items; maintained by PurchaseOrderItem.save() and release_counters()
+    total_ordered = models.IntegerField(default=0, editable=False)
+    total_fulfilled = models.IntegerField(default=0, editable=False)
+    item_count = models.IntegerField(default=0, editable=False)
+    fulfilled_item_count = models.IntegerField(default=0, editable=False)
+
+    objects = PurchaseOrderQuerySet.as_manager()
+
     def __str__(self):
         return f"PO-{str(self.id)[:8]} - {self.customer.name}"
 
@@ -103,44 +368,72 @@ class PurchaseOrder(models.Model):
     @property
     def overall_progress(self):
         """Calculate overall fulfillment progress"""
-        items = self.items.all()
-        if not items:
-            return 0
-        total_ordered = sum(item.quantity_ordered for item in items)
-        total_fulfilled = sum(item.quantity_fulfilled for item in items)
-        if total_ordered == 0:
+        if hasattr(self, 'annotated_progress'):
+            return self.annotated_progress
+        if self.total_ordered == 0:
             return 0
-        return (total_fulfilled / total_ordered) * 100
+        return (self.total_fulfilled / self.total_ordered) * 100
 
     @property
     def is_fully_fulfilled(self):
         """Check if all items are fully fulfilled"""
-        items = self.items.all()
-        if not items:
-            return False
-        return all(item.is_fulfilled for item in items)
+        if hasattr(self, 'annotated_unfulfilled_count'):
+            return self.annotated_items_count > 0 and self.annotated_unfulfilled_count == 0
+        return self.item_count > 0 and self.fulfilled_item_count == self.item_count
 
     @property
     def items_count(self):
         """Get count of line items"""
-        return self.items.count()
+        if hasattr(self, 'annotated_items_count'):
+            return self.annotated_items_count
+        return self.item_count
+
+    def save(self, *args, **kwargs):
+        """
+        Never write the stored counters over an existing row: they move only
+        through F() updates, which a save of an instance loaded earlier would
+        otherwise overwrite with its stale copies.
+        """
+        if not self._state.adding and not kwargs.get('force_insert'):
+            update_fields = kwargs.get('update_fields')
+            if update_fields is None:
+                update_fields = [
+                    field.name for field in self._meta.concrete_fields if not field.primary_key
+                ]
+            kwargs['update_fields'] = [field for field in update_fields if field not in self.COUNTER_FIELDS]
+        super().save(*args, **kwargs)
 
     def update_status_based_on_fulfillment(self):
         """Auto-update status based on fulfillment"""
         if self.status == 'cancelled':
             return  # Don't change cancelled orders
 
+        # Counters may have moved in the database since this instance was loaded
+        self.refresh_from_db(fields=self.COUNTER_FIELDS)
+
         if self.is_fully_fulfilled:
             self.status = 'completed'
         elif self.overall_progress > 0:
             self.status = 'in_progress'
         else:
             self.status = 'pending'
-        self.save(update_fields=['status'])
+        # updated_at changes too, so the export cache fingerprint sees the new status
+        self.save(update_fields=['status', 'updated_at'])
 
     class Meta:
         db_table = 'purchase_orders'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='po_created_idx'),
+            models.Index(fields=['status', 'created_at'], name='po_status_created_idx'),
+            models.Index(fields=['customer', 'created_at'], name='po_customer_created_idx'),
+            # Open-order backlog is a small, hot slice of the table
+            models.Index(
+                fields=['created_at', 'id'],
+                name='po_open_created_idx',
+                condition=Q(status__in=['pending', 'in_progress']),
+            ),
+        ]
 
 
 class PurchaseOrderItem(models.Model):
@@ -153,6 +446,72 @@ class PurchaseOrderItem(models.Model):
     def __str__(self):
         return f"{self.product_type.name} x{self.quantity_ordered}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        if {'purchase_order_id', 'quantity_ordered', 'quantity_fulfilled'} <= loaded.keys():
+            instance._counted = cls._counter_contribution(
+                loaded['purchase_order_id'], loaded['quantity_ordered'], loaded['quantity_fulfilled']
+            )
+        return instance
+
+    @staticmethod
+    def _counter_contribution(purchase_order_id, quantity_ordered, quantity_fulfilled):
+        """What a single item adds to its order's stored counters"""
+        return purchase_order_id, {
+            'total_ordered': quantity_ordered,
+            'total_fulfilled': quantity_fulfilled,
+            'item_count': 1,
+            'fulfilled_item_count': int(quantity_fulfilled >= quantity_ordered),
+        }
+
+    def _stored_contribution(self):
+        """Contribution of this item as currently stored in the database"""
+        if hasattr(self, '_counted'):
+            return self._counted
+        row = PurchaseOrderItem.objects.filter(pk=self.pk).values_list(
+            'purchase_order_id', 'quantity_ordered', 'quantity_fulfilled'
+        ).first()
+        return self._counter_contribution(*row) if row else None
+
+    @staticmethod
+    def _apply_counter_delta(purchase_order_id, delta, sign=1):
+        changes = {field: F(field) + sign * value for field, value in delta.items() if value}
+        if changes:
+            PurchaseOrder.objects.filter(pk=purchase_order_id).update(**changes)
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            previous = None if self._state.adding else self._stored_contribution()
+            super().save(*args, **kwargs)
+            current = self._counter_contribution(
+                self.purchase_order_id, self.quantity_ordered, self.quantity_fulfilled
+            )
+
+            if previous and previous[0] == current[0]:
+                delta = {field: current[1][field] - previous[1][field] for field in current[1]}
+                self._apply_counter_delta(current[0], delta)
+            else:
+                if previous:
+                    self._apply_counter_delta(previous[0], previous[1], sign=-1)
+                self._apply_counter_delta(current[0], current[1])
+            self._counted = current
+
+    def release_counters(self):
+        """
+        Take this deleted item off its order's stored counters.
+
+        Called from a post_delete receiver (core/signals.py) rather than a
+        delete() override, so items removed by cascade (deleting a product
+        type, customer or order) are counted too.
+        """
+        previous = getattr(self, '_counted', None) or self._counter_contribution(
+            self.purchase_order_id, self.quantity_ordered, self.quantity_fulfilled
+        )
+        self._apply_counter_delta(previous[0], previous[1], sign=-1)
+        self.__dict__.pop('_counted', None)
+
     @property
     def fulfillment_percentage(self):
         """Calculate fulfillment percentage for this item"""
@@ -174,6 +533,24 @@ class PurchaseOrderItem(models.Model):
         db_table = 'purchase_order_items'
 
 
+class ProductionAllocation(models.Model):
+    """
+    Units of one production entry assigned to one order item by
+    core.services.allocation; lets deletions and cancellations be undone.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    production = models.ForeignKey(DailyProduction, on_delete=models.CASCADE, related_name='allocations')
+    order_item = models.ForeignKey(PurchaseOrderItem, on_delete=models.CASCADE, related_name='allocations')
+    quantity = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.quantity} x {self.production} -> {self.order_item}"
+
+    class Meta:
+        db_table = 'production_allocations'
+
+
 class PurchaseOrderUpdate(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     purchase_order = models.ForeignKey(PurchaseOrder, on_delete=models.CASCADE, related_name='updates')
@@ -187,3 +564,61 @@ class PurchaseOrderUpdate(models.Model):
     class Meta:
         db_table = 'purchase_order_updates'
         ordering = ['-created_at']
+
+
+class ExportJob(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+        ('expired', 'Expired'),
+    ]
+
+    FORMAT_CHOICES = [
+        ('excel', 'Excel'),
+        ('pdf', 'PDF'),
+        ('csv', 'CSV'),
+        ('parquet', 'Parquet'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    export_type = models.CharField(max_length=50)  # key in core.services.export_sources.EXPORT_REGISTRY
+    export_format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    filters = models.JSONField(default=dict, blank=True)  # List-page filter parameters
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='export_jobs'
+    )
+    rows_processed = models.IntegerField(default=0)
+    rows_total = models.IntegerField(blank=True, null=True)
+    file_name = models.CharField(max_length=255, blank=True)
+    file_size = models.BigIntegerField(blank=True, null=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    expires_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.export_type} ({self.export_format}) - {self.get_status_display()}"
+
+    @property
+    def progress(self):
+        """Percentage of rows written, when the total is known"""
+        if self.status == 'done':
+            return 100
+        if not self.rows_total:
+            return 0
+        return min(100, (self.rows_processed / self.rows_total) * 100)
+
+    @property
+    def is_finished(self):
+        return self.status in ('done', 'failed', 'expired')
+
+    class Meta:
+        db_table = 'export_jobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='export_job_status_created_idx'),
+        ]
@@ -0,0 +1,164 @@
+"""
+FIFO allocation of production to open orders.
+
+Units recorded in DailyProduction that are not yet allocated are assigned to
+the open order items of the same product, oldest order first. The whole run
+reads its production rows and candidate items in two queries, walks them in
+memory, and writes the results back with batched `UPDATE ... CASE`
+statements: item fulfillment, production allocation, then the affected
+orders' stored counters (recompute_fulfillment_counters) and statuses.
+
+Every assignment is recorded as a ProductionAllocation, so it can be undone:
+release_allocations() hands the units back when production is deleted or an
+order is cancelled or deleted, after which allocate_production() gives any
+freed production to the next open orders. Production recorded before the
+links existed has none and is treated as delivered.
+"""
+from collections import deque
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+from ..models import DailyProduction, ProductionAllocation, PurchaseOrder, PurchaseOrderItem
+from .dashboard import invalidate_dashboard_snapshot
+
+OPEN_STATUSES = ('pending', 'in_progress')
+
+# Rows per UPDATE ... CASE statement
+ALLOCATION_BATCH_SIZE = 500
+
+
+def _bulk_set(model, field: str, values: dict):
+    """Set `field` to a per-row value or expression with one UPDATE ... CASE per batch of primary keys."""
+    pks = list(values)
+    for start in range(0, len(pks), ALLOCATION_BATCH_SIZE):
+        batch = pks[start:start + ALLOCATION_BATCH_SIZE]
+        model.objects.filter(pk__in=batch).update(**{
+            field: Case(
+                *[When(pk=pk, then=values[pk] if hasattr(values[pk], 'resolve_expression') else Value(values[pk]))
+                  for pk in batch],
+                default=F(field),
+            )
+        })
+
+
+def _update_order_statuses(orders):
+    """Recompute counters, then derive every order's status from them in one UPDATE."""
+    orders.recompute_fulfillment_counters()
+    return orders.exclude(status='cancelled').update(
+        status=Case(
+            When(Q(item_count__gt=0) & Q(fulfilled_item_count=F('item_count')), then=Value('completed')),
+            When(total_fulfilled__gt=0, then=Value('in_progress')),
+            default=Value('pending'),
+        ),
+        updated_at=timezone.now(),
+    )
+
+
+def allocate_production(date=None, product_type_ids=None) -> dict:
+    """
+    Assign unallocated production to open order items, oldest order first.
+
+    Args:
+        date: Only allocate production recorded for this day
+        product_type_ids: Only allocate production of these products
+
+    Returns:
+        Dict with the units allocated and the items and orders updated
+    """
+    with transaction.atomic():
+        production = DailyProduction.objects.filter(quantity_allocated__lt=F('quantity'))
+        if date is not None:
+            production = production.filter(date=date)
+        if product_type_ids is not None:
+            production = production.filter(product_type_id__in=product_type_ids)
+        production = list(
+            production.select_for_update()
+            .order_by('date', 'created_at', 'id')
+            .values_list('id', 'product_type_id', 'quantity', 'quantity_allocated')
+        )
+
+        items_by_product = {}
+        items = (
+            PurchaseOrderItem.objects
+            .filter(
+                product_type_id__in={product_type_id for _, product_type_id, _, _ in production},
+                purchase_order__status__in=OPEN_STATUSES,
+                quantity_fulfilled__lt=F('quantity_ordered'),
+            )
+            .select_for_update(of=('self',))
+            .order_by('purchase_order__created_at', 'purchase_order_id', 'id')
+            .values_list('id', 'purchase_order_id', 'product_type_id', 'quantity_ordered', 'quantity_fulfilled')
+        )
+        for item_id, order_id, product_type_id, ordered, fulfilled in items:
+            items_by_product.setdefault(product_type_id, deque()).append([item_id, order_id, ordered, fulfilled])
+
+        fulfilled_updates = {}
+        allocated_updates = {}
+        links = []
+        order_ids = set()
+        units = 0
+        for production_id, product_type_id, quantity, allocated in production:
+            queue = items_by_product.get(product_type_id, ())
+            available = quantity - allocated
+            while available and queue:
+                item = queue[0]
+                take = min(available, item[2] - item[3])
+                item[3] += take
+                available -= take
+                units += take
+                links.append(ProductionAllocation(production_id=production_id, order_item_id=item[0], quantity=take))
+                fulfilled_updates[item[0]] = item[3]
+                order_ids.add(item[1])
+                if item[3] >= item[2]:
+                    queue.popleft()
+            if quantity - available != allocated:
+                allocated_updates[production_id] = quantity - available
+
+        if units:
+            _bulk_set(PurchaseOrderItem, 'quantity_fulfilled', fulfilled_updates)
+            _bulk_set(DailyProduction, 'quantity_allocated', allocated_updates)
+            ProductionAllocation.objects.bulk_create(links, batch_size=ALLOCATION_BATCH_SIZE)
+            _update_order_statuses(PurchaseOrder.objects.filter(pk__in=order_ids))
+            transaction.on_commit(invalidate_dashboard_snapshot)
+
+    return {'units': units, 'items': len(fulfilled_updates), 'orders': len(order_ids)}
+
+
+def release_allocations(allocations) -> set:
+    """
+    Undo allocations: take their units off item fulfillment and production,
+    delete them and refresh the affected orders' counters and statuses.
+
+    Call before deleting production or order items, or after cancelling an
+    order, then pass the returned product type ids to allocate_production()
+    so freed production and reopened items are matched again.
+
+    Args:
+        allocations: ProductionAllocation queryset to release
+
+    Returns:
+        Ids of the product types whose allocations were released
+    """
+    with transaction.atomic():
+        rows = list(allocations.select_for_update(of=('self',)).values_list(
+            'id', 'production_id', 'order_item_id', 'order_item__purchase_order_id',
+            'production__product_type_id', 'quantity',
+        ))
+        if not rows:
+            return set()
+
+        by_item, by_production = {}, {}
+        for _, production_id, item_id, _, _, quantity in rows:
+            by_item[item_id] = by_item.get(item_id, 0) + quantity
+            by_production[production_id] = by_production.get(production_id, 0) + quantity
+
+        _bulk_set(PurchaseOrderItem, 'quantity_fulfilled',
+                  {pk: F('quantity_fulfilled') - quantity for pk, quantity in by_item.items()})
+        _bulk_set(DailyProduction, 'quantity_allocated',
+                  {pk: F('quantity_allocated') - quantity for pk, quantity in by_production.items()})
+        ProductionAllocation.objects.filter(pk__in=[row[0] for row in rows]).delete()
+        _update_order_statuses(PurchaseOrder.objects.filter(pk__in={row[3] for row in rows}))
+        transaction.on_commit(invalidate_dashboard_snapshot)
+
+    return {row[4] for row in rows}
@@ -0,0 +1,56 @@
+"""
+Dashboard KPI snapshot.
+
+Everyone lands on the dashboard after login, so the counts are computed with
+one conditional aggregate per table and cached for a short time. Saving or
+deleting an entry drops the snapshot (see core/signals.py).
+"""
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from ..models import DailyConsumption, DailyProduction, PurchaseOrder
+
+DASHBOARD_CACHE_KEY = 'core:dashboard:snapshot'
+
+
+def compute_dashboard_snapshot(today=None) -> dict:
+    """Compute today's and last 7 days' activity plus the open-order backlog."""
+    today = today or timezone.now().date()
+    last_7_days = today - timedelta(days=7)
+
+    consumption = DailyConsumption.objects.filter(date__gte=last_7_days).aggregate(
+        today_consumption_count=Count('id', filter=Q(date=today)),
+        recent_consumptions=Count('id'),
+    )
+    production = DailyProduction.objects.filter(date__gte=last_7_days).aggregate(
+        today_production_count=Count('id', filter=Q(date=today)),
+        recent_productions=Count('id'),
+        today_units_produced=Sum('quantity', filter=Q(date=today)),
+    )
+    backlog = PurchaseOrder.objects.filter(status__in=['pending', 'in_progress']).aggregate(
+        open_orders=Count('id'),
+        open_units=Sum(F('total_ordered') - F('total_fulfilled')),
+    )
+
+    snapshot = {'today': today, **consumption, **production, **backlog}
+    snapshot['today_units_produced'] = snapshot['today_units_produced'] or 0
+    snapshot['open_units'] = max(snapshot['open_units'] or 0, 0)
+    return snapshot
+
+
+def get_dashboard_snapshot() -> dict:
+    """Return the cached snapshot, recomputing it when missing or from another day."""
+    today = timezone.now().date()
+    snapshot = cache.get(DASHBOARD_CACHE_KEY)
+    if snapshot is None or snapshot['today'] != today:
+        snapshot = compute_dashboard_snapshot(today)
+        cache.set(DASHBOARD_CACHE_KEY, snapshot, settings.DASHBOARD_CACHE_SECONDS)
+    return snapshot
+
+
+def invalidate_dashboard_snapshot(**kwargs):
+    """Drop the cached snapshot; usable directly as a signal receiver."""
+    cache.delete(DASHBOARD_CACHE_KEY)
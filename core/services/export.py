@@ -1,17 +1,114 @@
 """
 Export service for generating PDF and Excel files from kitchen management data.
 """
-from datetime import datetime
-from io import BytesIO
+import csv
+import multiprocessing
+import os
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from copy import copy
+from datetime import date, datetime
+from io import BytesIO, StringIO
+from itertools import chain, islice
+from tempfile import SpooledTemporaryFile, TemporaryDirectory
+from xml.sax.saxutils import escape
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import getFont, stringWidth
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Optional: only needed for Parquet exports
+    pyarrow = None
+
+PARQUET_AVAILABLE = pyarrow is not None
+
+EXCEL_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Style objects shared by every cell instead of being rebuilt per cell
+TITLE_FONT = Font(bold=True, size=14)
+EXPORTED_FONT = Font(italic=True, size=9)
+BOLD_FONT = Font(bold=True)
+SUMMARY_FONT = Font(bold=True, size=11)
+HEADER_FONT = Font(bold=True, color="FFFFFF")
+HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="center")
+DATA_ALIGNMENT = Alignment(horizontal="left", vertical="center")
+THIN_BORDER = Border(
+    left=Side(style='thin'),
+    right=Side(style='thin'),
+    top=Side(style='thin'),
+    bottom=Side(style='thin')
+)
+
+# Streaming exports size columns from this many leading rows
+WIDTH_SAMPLE_ROWS = 200
+# Generated files stay in memory up to this size, then spill to a temp file
+SPOOL_MAX_SIZE = 5 * 1024 * 1024
+# CSV exports are flushed to the client every this many rows
+CSV_BATCH_ROWS = 500
+
+# PDF tables use fixed single-line rows so every page holds a known number of them
+PDF_HEADER_COLOR = colors.HexColor('#366092')
+PDF_FONT_SIZE = 9
+PDF_HEADER_HEIGHT = 20
+PDF_ROW_HEIGHT = 14
+PDF_CELL_PADDING = 4
+# Widest glyph stringWidth can return for Helvetica text, in em, including characters
+# it draws from the Symbol/ZapfDingbats substitution fonts (e.g. '@' is 1.015 em)
+PDF_MAX_GLYPH_EM = max(max(font.widths) for font in [getFont('Helvetica'), *getFont('Helvetica').substitutionFonts]) / 1000
+# Columns are never narrower than this many characters of the header/content
+PDF_MIN_COLUMN_CHARS = 4
+# Parallel PDF exports hand each worker process this many pages at a time
+PDF_CHUNK_PAGES = 50
+PDF_FOOTER_TEXT = "Cebu Best Value Trading - Kitchen Management System"
+PDF_TABLE_STYLE = TableStyle([
+    # Header styling
+    ('BACKGROUND', (0, 0), (-1, 0), PDF_HEADER_COLOR),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+
+    # Data styling
+    ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), PDF_FONT_SIZE),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F0F0F0')]),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('LEFTPADDING', (0, 0), (-1, -1), PDF_CELL_PADDING),
+    ('RIGHTPADDING', (0, 0), (-1, -1), PDF_CELL_PADDING),
+    ('TOPPADDING', (0, 0), (-1, -1), 0),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
+])
+
+# Parquet exports write a row group every this many rows
+PARQUET_ROW_GROUP_ROWS = 50000
+
+FILE_EXTENSIONS = {
+    'excel': 'xlsx',
+    'pdf': 'pdf',
+    'csv': 'csv',
+    'parquet': 'parquet',
+}
+
+CONTENT_TYPES = {
+    'excel': EXCEL_CONTENT_TYPE,
+    'pdf': 'application/pdf',
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
 
 def get_export_filename(module_name: str, export_format: str) -> str:
     """Generate timestamped filename for exports."""
@@ -37,7 +134,7 @@ def export_to_excel(data_dict: dict, headers: list) -> BytesIO:
     # Add title if provided
     if data_dict.get('title'):
         ws['A1'] = data_dict['title']
-        ws['A1'].font = Font(bold=True, size=14)
+        ws['A1'].font = TITLE_FONT
         ws.merge_cells('A1:Z1')
         current_row = 3
     else:
@@ -45,7 +142,7 @@ def export_to_excel(data_dict: dict, headers: list) -> BytesIO:
 
     # Add export date
     ws[f'A{current_row}'] = f"Exported: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-    ws[f'A{current_row}'].font = Font(italic=True, size=9)
+    ws[f'A{current_row}'].font = EXPORTED_FONT
     current_row += 2
 
     # Add headers
@@ -53,9 +150,9 @@ def export_to_excel(data_dict: dict, headers: list) -> BytesIO:
     for col_idx, header in enumerate(headers, 1):
         cell = ws.cell(row=header_row, column=col_idx)
         cell.value = header
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        cell.alignment = Alignment(horizontal="center", vertical="center")
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
+        cell.alignment = HEADER_ALIGNMENT
 
     # Add data rows
     data_rows = data_dict.get('data', [])
@@ -63,16 +160,8 @@ def export_to_excel(data_dict: dict, headers: list) -> BytesIO:
         for col_idx, header in enumerate(headers, 1):
             cell = ws.cell(row=row_idx, column=col_idx)
             cell.value = row_data.get(header, '')
-            cell.alignment = Alignment(horizontal="left", vertical="center")
-
-            # Add borders
-            thin_border = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
-            )
-            cell.border = thin_border
+            cell.alignment = DATA_ALIGNMENT
+            cell.border = THIN_BORDER
 
     # Auto-adjust column widths
     for col_idx, header in enumerate(headers, 1):
@@ -90,12 +179,12 @@ def export_to_excel(data_dict: dict, headers: list) -> BytesIO:
     if data_dict.get('summary'):
         summary_row = header_row + len(data_rows) + 2
         ws[f'A{summary_row}'] = "Summary"
-        ws[f'A{summary_row}'].font = Font(bold=True, size=11)
+        ws[f'A{summary_row}'].font = SUMMARY_FONT
 
         for idx, (key, value) in enumerate(data_dict['summary'].items(), 1):
             ws[f'A{summary_row + idx}'] = f"{key}:"
             ws[f'B{summary_row + idx}'] = value
-            ws[f'A{summary_row + idx}'].font = Font(bold=True)
+            ws[f'A{summary_row + idx}'].font = BOLD_FONT
 
     # Return BytesIO object
     output = BytesIO()
@@ -104,6 +193,185 @@ def export_to_excel(data_dict: dict, headers: list) -> BytesIO:
     return output
 
 
+def _column_widths(headers: list, sample_rows: list) -> list:
+    """Estimate column widths from the headers and a sample of rows."""
+    widths = [len(str(header)) for header in headers]
+    for row in sample_rows:
+        for col_idx, value in enumerate(row):
+            widths[col_idx] = max(widths[col_idx], len(str(value)))
+    return [min(width + 2, 50) for width in widths]
+
+
+def _styled_cell(ws, value, font=None, fill=None, alignment=None, border=None, number_format=None):
+    cell = WriteOnlyCell(ws, value=value)
+    if font:
+        cell.font = font
+    if fill:
+        cell.fill = fill
+    if alignment:
+        cell.alignment = alignment
+    if border:
+        cell.border = border
+    if number_format:
+        cell.number_format = number_format
+    return cell
+
+
+def _write_excel_sheet(wb, rows, headers: list, title: str = None, sheet_name: str = 'Data', summary=None):
+    """Append one write-only worksheet to `wb`, consuming `rows` as it goes."""
+    ws = wb.create_sheet(title=sheet_name)
+
+    rows = iter(rows)
+    sample = list(islice(rows, WIDTH_SAMPLE_ROWS))
+    for col_idx, width in enumerate(_column_widths(headers, sample), 1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = width
+
+    if title:
+        ws.append([_styled_cell(ws, title, font=TITLE_FONT)])
+        ws.append([])
+
+    exported = f"Exported: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+    ws.append([_styled_cell(ws, exported, font=EXPORTED_FONT)])
+    ws.append([])
+
+    ws.append([
+        _styled_cell(ws, header, font=HEADER_FONT, fill=HEADER_FILL, alignment=HEADER_ALIGNMENT)
+        for header in headers
+    ])
+
+    # Register data styles once; each cell then copies the style ids instead
+    # of re-hashing Font/Border objects
+    data_style = _styled_cell(ws, None, alignment=DATA_ALIGNMENT, border=THIN_BORDER)._style
+    date_style = _styled_cell(
+        ws, None, alignment=DATA_ALIGNMENT, border=THIN_BORDER, number_format='yyyy-mm-dd'
+    )._style
+
+    for row in chain(sample, rows):
+        cells = []
+        for value in row:
+            cell = WriteOnlyCell(ws, value=value)
+            cell._style = copy(date_style if isinstance(value, date) else data_style)
+            cells.append(cell)
+        ws.append(cells)
+
+    if callable(summary):
+        summary = summary()
+    if summary:
+        ws.append([])
+        ws.append([_styled_cell(ws, "Summary", font=SUMMARY_FONT)])
+        for key, value in summary.items():
+            ws.append([_styled_cell(ws, f"{key}:", font=BOLD_FONT), value])
+
+
+def export_to_excel_stream(rows, headers: list, title: str = None, sheet_name: str = 'Data',
+                           summary=None, output=None):
+    """
+    Generate an Excel workbook from a row iterator using a write-only worksheet.
+
+    Rows are written as they are read, so memory stays flat however many rows
+    the iterator yields. Column widths come from the first WIDTH_SAMPLE_ROWS rows.
+
+    Args:
+        rows: Iterable of sequences in header order (e.g. a values_list iterator)
+        headers: List of column headers
+        title: Optional sheet title
+        sheet_name: Worksheet name
+        summary: Dict of summary values, or a callable returning one that is
+            called after all rows are written (for totals gathered while streaming)
+        output: Optional binary file to write to; defaults to a SpooledTemporaryFile
+
+    Returns:
+        The output file, positioned at the start of the Excel file
+    """
+    wb = Workbook(write_only=True)
+    _write_excel_sheet(wb, rows, headers, title=title, sheet_name=sheet_name, summary=summary)
+
+    if output is None:
+        output = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    wb.save(output)
+    output.seek(0)
+    return output
+
+
+def export_to_excel_workbook(sheets, output=None):
+    """
+    Generate one Excel workbook with a write-only worksheet per row source.
+
+    Args:
+        sheets: Iterable of row sources (dicts with 'headers', 'rows', 'title',
+            'sheet_name' and 'summary'); each is consumed before the next is started
+        output: Optional binary file to write to; defaults to a SpooledTemporaryFile
+
+    Returns:
+        The output file, positioned at the start of the Excel file
+    """
+    wb = Workbook(write_only=True)
+    for source in sheets:
+        _write_excel_sheet(
+            wb, source['rows'], source['headers'],
+            title=source['title'],
+            sheet_name=source['sheet_name'],
+            summary=source['summary'],
+        )
+
+    if output is None:
+        output = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    wb.save(output)
+    output.seek(0)
+    return output
+
+
+def export_to_csv_stream(rows, headers: list, delimiter: str = ',', compress: bool = False):
+    """
+    Generate CSV output as a stream of encoded chunks.
+
+    The header is yielded before any row is read so the client gets its first
+    byte immediately; rows follow in batches of CSV_BATCH_ROWS.
+
+    Args:
+        rows: Iterable of sequences in header order
+        headers: List of column headers
+        delimiter: Field delimiter (',' for CSV, '\t' for TSV)
+        compress: Gzip the stream
+
+    Yields:
+        bytes chunks suitable for StreamingHttpResponse
+    """
+    buffer = StringIO()
+    writer = csv.writer(buffer, delimiter=delimiter)
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+
+    def drain(flush_mode=None):
+        data = buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+        if compressor is None:
+            return data
+        data = compressor.compress(data)
+        if flush_mode is not None:
+            data += compressor.flush(flush_mode)
+        return data
+
+    # BOM so Excel opens the UTF-8 file with the right encoding
+    buffer.write('\ufeff')
+    writer.writerow(headers)
+    yield drain(zlib.Z_SYNC_FLUSH)
+
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= CSV_BATCH_ROWS:
+            chunk = drain()
+            if chunk:
+                yield chunk
+            pending = 0
+
+    chunk = drain(zlib.Z_FINISH)
+    if chunk:
+        yield chunk
+
+
 def export_to_pdf(data_dict: dict, headers: list) -> BytesIO:
     """
     Generate PDF from data dictionary.
@@ -188,3 +456,380 @@ def export_to_pdf(data_dict: dict, headers: list) -> BytesIO:
     doc.build(story)
     output.seek(0)
     return output
+
+
+def _pdf_text(value) -> str:
+    return '' if value is None else str(value)
+
+
+def _pdf_column_widths(headers: list, sample_rows: list, total_width: float) -> list:
+    """
+    Split the page width between columns by the content they hold.
+
+    Each column is weighted by the 90th-percentile text length of a sample of
+    rows (or its header, if longer), so a few long values do not starve the
+    other columns.
+    """
+    weights = []
+    for col_idx, header in enumerate(headers):
+        lengths = sorted(len(_pdf_text(row[col_idx])) for row in sample_rows)
+        typical = lengths[int(len(lengths) * 0.9)] if lengths else 0
+        weights.append(max(typical, len(header), PDF_MIN_COLUMN_CHARS))
+    scale = total_width / sum(weights)
+    return [weight * scale for weight in weights]
+
+
+def _pdf_fitter(width: float):
+    """Return a function that shortens text to fit a column on one line."""
+    available = width - 2 * PDF_CELL_PADDING
+    # Strings this short fit even if every character is the widest glyph
+    safe_length = int(available // (PDF_MAX_GLYPH_EM * PDF_FONT_SIZE))
+
+    def fit(value):
+        text = _pdf_text(value)
+        if len(text) <= safe_length or stringWidth(text, 'Helvetica', PDF_FONT_SIZE) <= available:
+            return text
+        # Binary search for the longest prefix that fits with the ellipsis
+        low, high = 0, len(text)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if stringWidth(text[:middle] + '…', 'Helvetica', PDF_FONT_SIZE) <= available:
+                low = middle
+            else:
+                high = middle - 1
+        return text[:low] + '…'
+
+    return fit
+
+
+class _LazyStory(list):
+    """Flowable list that reportlab drains from the front; refilled from a generator one item at a time."""
+
+    def __init__(self, flowables):
+        super().__init__()
+        self._pending = iter(flowables)
+
+    def __len__(self):
+        if not super().__len__():
+            flowable = next(self._pending, None)
+            if flowable is not None:
+                self.append(flowable)
+        return super().__len__()
+
+
+def _draw_page_number(canvas, doc):
+    canvas.saveState()
+    canvas.setFont('Helvetica', 8)
+    canvas.setFillColor(colors.grey)
+    canvas.drawString(doc.leftMargin, 0.5 * inch, PDF_FOOTER_TEXT)
+    canvas.drawRightString(doc.leftMargin + doc.width, 0.5 * inch, f"Page {doc.page + doc.page_offset}")
+    canvas.restoreState()
+
+
+def _pdf_document(output, page_offset: int = 0):
+    """Report document; page numbers start after `page_offset` pages."""
+    doc = SimpleDocTemplate(output, pagesize=letter, bottomMargin=0.9 * inch)
+    doc.page_offset = page_offset
+    return doc
+
+
+def _pdf_intro(title: str = None) -> list:
+    """Title and export timestamp flowables at the top of the first page"""
+    styles = getSampleStyleSheet()
+    intro = []
+    if title:
+        title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=16,
+            textColor=PDF_HEADER_COLOR,
+            spaceAfter=12,
+            alignment=1  # center
+        )
+        intro.append(Paragraph(title, title_style))
+    intro.append(Paragraph(f"Exported: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
+    intro.append(Spacer(1, 0.3 * inch))
+    return intro
+
+
+def _pdf_summary(summary: dict) -> list:
+    styles = getSampleStyleSheet()
+    flowables = [Spacer(1, 0.3 * inch), Paragraph("Summary", styles['Heading2'])]
+    for key, value in summary.items():
+        # Keys and values hold user data (material names, filter values); Paragraph parses markup
+        flowables.append(Paragraph(f"<b>{escape(str(key))}:</b> {escape(str(value))}", styles['Normal']))
+    return flowables
+
+
+def _pdf_page_capacity(doc, intro: list) -> tuple:
+    """Rows that fit on the first page (below the intro) and on every later page"""
+    # Frame padding is 6pt top and bottom; leave 1pt of slack for rounding
+    frame_height = doc.height - 13
+    intro_height = sum(
+        flowable.wrap(doc.width, doc.height)[1] + flowable.getSpaceBefore() + flowable.getSpaceAfter()
+        for flowable in intro
+    )
+
+    def rows_in(height):
+        return max(1, int((height - PDF_HEADER_HEIGHT) // PDF_ROW_HEIGHT))
+
+    return rows_in(frame_height - intro_height), rows_in(frame_height)
+
+
+def _pdf_page_count(row_count: int, first_page_rows: int, page_rows: int) -> int:
+    """Pages _pdf_table_pages() produces for `row_count` rows (at least one)"""
+    if row_count <= first_page_rows:
+        return 1
+    return 1 + -(-(row_count - first_page_rows) // page_rows)
+
+
+def _pdf_table_pages(rows, headers: list, col_widths: list, first_page_rows: int, page_rows: int):
+    """Yield one fixed-height LongTable per page, separated by page breaks."""
+    fitters = [_pdf_fitter(width) for width in col_widths]
+    rows = iter(rows)
+    capacity = first_page_rows
+    first = True
+    while True:
+        page = [[fit(value) for fit, value in zip(fitters, row)] for row in islice(rows, capacity)]
+        if not first:
+            if not page:
+                break
+            yield PageBreak()
+        table = LongTable(
+            [headers] + page,
+            colWidths=col_widths,
+            rowHeights=[PDF_HEADER_HEIGHT] + [PDF_ROW_HEIGHT] * len(page),
+            repeatRows=1,
+        )
+        table.setStyle(PDF_TABLE_STYLE)
+        yield table
+        capacity = page_rows
+        first = False
+
+
+def _build_pdf(doc, flowables):
+    doc.build(_LazyStory(flowables), onFirstPage=_draw_page_number, onLaterPages=_draw_page_number)
+
+
+def export_to_pdf_stream(rows, headers: list, title: str = None, summary=None, output=None):
+    """
+    Generate a PDF report from a row iterator in bounded memory.
+
+    Rows are read one page at a time and laid out as a LongTable per page with
+    the header row repeated, so only the current page's rows are held in
+    memory and layout time grows linearly with the row count. Column widths
+    come from the first WIDTH_SAMPLE_ROWS rows; over-long values are cut to
+    one line so every row has the same height.
+
+    Args:
+        rows: Iterable of sequences in header order (e.g. a values_list iterator)
+        headers: List of column headers
+        title: Optional report title
+        summary: Dict of summary values, or a callable returning one that is
+            called after all rows are written
+        output: Optional binary file to write to; defaults to a SpooledTemporaryFile
+
+    Returns:
+        The output file, positioned at the start of the PDF
+    """
+    if output is None:
+        output = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    doc = _pdf_document(output)
+    intro = _pdf_intro(title)
+
+    rows = iter(rows)
+    sample = list(islice(rows, WIDTH_SAMPLE_ROWS))
+    col_widths = _pdf_column_widths(headers, sample, doc.width)
+    first_page_rows, page_rows = _pdf_page_capacity(doc, intro)
+
+    def story():
+        yield from intro
+        yield from _pdf_table_pages(chain(sample, rows), headers, col_widths, first_page_rows, page_rows)
+        report_summary = summary() if callable(summary) else summary
+        if report_summary:
+            yield from _pdf_summary(report_summary)
+
+    _build_pdf(doc, story())
+    output.seek(0)
+    return output
+
+
+def _render_pdf_part(path: str, rows: list, headers: list, col_widths: list, title: str = None,
+                     page_offset: int = 0):
+    """Render one page-aligned range of rows to `path`; runs in a worker process."""
+    with open(path, 'wb') as output:
+        doc = _pdf_document(output, page_offset)
+        intro = _pdf_intro(title) if page_offset == 0 else []
+        first_page_rows, page_rows = _pdf_page_capacity(doc, intro)
+        _build_pdf(doc, chain(intro, _pdf_table_pages(rows, headers, col_widths, first_page_rows, page_rows)))
+    return path
+
+
+def export_to_pdf_parallel(rows, headers: list, title: str = None, summary=None, output=None,
+                           workers: int = None, chunk_pages: int = PDF_CHUNK_PAGES):
+    """
+    Generate a PDF report using a pool of worker processes.
+
+    Rows are read in page-aligned ranges of `chunk_pages` pages; each range
+    is rendered by a ProcessPoolExecutor worker with its page numbers offset
+    by the pages before it, and the parts are concatenated with the summary
+    on its own final page. Produces the same layout as export_to_pdf_stream().
+    At most two ranges per worker are in flight, so memory stays bounded.
+
+    Args:
+        rows: Iterable of sequences in header order (e.g. a values_list iterator)
+        headers: List of column headers
+        title: Optional report title
+        summary: Dict of summary values, or a callable returning one that is
+            called after all rows are read
+        output: Optional binary file to write to; defaults to a SpooledTemporaryFile
+        workers: Worker processes (default: one per CPU)
+        chunk_pages: Pages rendered per task
+
+    Returns:
+        The output file, positioned at the start of the PDF
+    """
+    from pypdf import PdfWriter
+
+    if output is None:
+        output = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    workers = workers or os.cpu_count() or 1
+
+    rows = iter(rows)
+    sample = list(islice(rows, WIDTH_SAMPLE_ROWS))
+    doc = _pdf_document(BytesIO())
+    col_widths = _pdf_column_widths(headers, sample, doc.width)
+    first_page_rows, page_rows = _pdf_page_capacity(doc, _pdf_intro(title))
+    pending = chain(sample, rows)
+
+    with TemporaryDirectory() as part_dir, ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context('spawn')
+    ) as pool:
+        parts = []
+        in_flight = deque()
+        page_offset = 0
+        while True:
+            first = page_offset == 0
+            size = first_page_rows + (chunk_pages - 1) * page_rows if first else chunk_pages * page_rows
+            chunk = list(islice(pending, size))
+            if not chunk and not first:
+                break
+            path = os.path.join(part_dir, f'part-{len(parts):05d}.pdf')
+            in_flight.append(pool.submit(
+                _render_pdf_part, path, chunk, headers, col_widths, title if first else None, page_offset
+            ))
+            parts.append(path)
+            page_offset += _pdf_page_count(len(chunk), first_page_rows if first else page_rows, page_rows)
+            if len(in_flight) >= 2 * workers:
+                in_flight.popleft().result()
+            if len(chunk) < size:
+                break
+        for future in in_flight:
+            future.result()
+
+        report_summary = summary() if callable(summary) else summary
+        if report_summary:
+            summary_path = os.path.join(part_dir, 'summary.pdf')
+            with open(summary_path, 'wb') as summary_file:
+                _build_pdf(_pdf_document(summary_file, page_offset), _pdf_summary(report_summary))
+            parts.append(summary_path)
+
+        writer = PdfWriter()
+        for path in parts:
+            writer.append(path)
+        writer.write(output)
+
+    output.seek(0)
+    return output
+
+
+def _arrow_type(kind: str, precision: tuple = None):
+    """pyarrow type for a fact column kind"""
+    if kind == 'decimal':
+        return pyarrow.decimal128(*precision)
+    return {
+        'date': pyarrow.date32(),
+        'integer': pyarrow.int64(),
+        'string': pyarrow.string(),
+        'category': pyarrow.dictionary(pyarrow.int32(), pyarrow.string()),
+        'timestamp': pyarrow.timestamp('us', tz='UTC'),
+    }[kind]
+
+
+def export_to_parquet(rows, schema: list, output=None, row_group_rows: int = PARQUET_ROW_GROUP_ROWS):
+    """
+    Write rows to a Parquet file with typed columns, one row group per batch.
+
+    Only one batch of rows is held in memory at a time. Requires pyarrow.
+
+    Args:
+        rows: Iterable of sequences in schema order (e.g. a values_list iterator)
+        schema: List of (name, kind, precision) tuples; kind is one of 'date',
+            'decimal', 'integer', 'string', 'category' (dictionary-encoded) or
+            'timestamp', and precision is (digits, places) for decimals
+        output: Optional binary file to write to; defaults to a SpooledTemporaryFile
+        row_group_rows: Rows per row group
+
+    Returns:
+        The output file, positioned at the start of the Parquet file
+    """
+    if pyarrow is None:
+        raise ImportError('Parquet exports require the pyarrow package')
+    if output is None:
+        output = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+
+    arrow_schema = pyarrow.schema([
+        (name, _arrow_type(kind, precision)) for name, kind, precision in schema
+    ])
+    rows = iter(rows)
+    with pyarrow.parquet.ParquetWriter(output, arrow_schema, compression='snappy') as writer:
+        while True:
+            batch = list(islice(rows, row_group_rows))
+            if not batch:
+                break
+            columns = [
+                pyarrow.array(values, type=field.type)
+                for values, field in zip(zip(*batch), arrow_schema)
+            ]
+            writer.write_batch(pyarrow.record_batch(columns, schema=arrow_schema))
+    output.seek(0)
+    return output
+
+
+def write_export(source: dict, export_format: str, output, rows=None, pdf_workers: int = 1):
+    """
+    Write a row source to an open binary file in the given format.
+
+    PDFs are rendered across `pdf_workers` processes when it is above one.
+    """
+    rows = source['rows'] if rows is None else rows
+    headers = source['headers']
+
+    if export_format == 'excel':
+        export_to_excel_stream(
+            rows, headers,
+            title=source['title'],
+            sheet_name=source['sheet_name'],
+            summary=source['summary'],
+            output=output,
+        )
+    elif export_format == 'pdf' and pdf_workers > 1:
+        export_to_pdf_parallel(
+            rows, headers,
+            title=source['title'],
+            summary=source['summary'],
+            output=output,
+            workers=pdf_workers,
+        )
+    elif export_format == 'pdf':
+        export_to_pdf_stream(
+            rows, headers,
+            title=source['title'],
+            summary=source['summary'],
+            output=output,
+        )
+    elif export_format == 'parquet':
+        export_to_parquet(rows, source['schema'], output=output)
+    else:
+        for chunk in export_to_csv_stream(rows, headers):
+            output.write(chunk)
@@ -0,0 +1,180 @@
+"""
+On-disk cache of generated export files.
+
+Files are keyed by export type, format, filters and a data-version
+fingerprint of the tables the export reads. A repeat download of unchanged
+data is served straight from disk; any insert, edit or delete in a source
+table changes the fingerprint, so stale files are simply never looked up
+again and age out through eviction.
+"""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from django.conf import settings
+from django.db.models import Count, Max, Sum
+
+from ..models import (
+    RawMaterial, DailyConsumption, ProductType, DailyProduction, Customer, PurchaseOrder, PurchaseOrderItem
+)
+from .export import FILE_EXTENSIONS
+from .export_sources import EXPORT_REGISTRY
+
+# Per table: (model, timestamp field, extra fields whose sum changes on in-place updates)
+TABLE_FINGERPRINTS = {
+    'raw_materials': (RawMaterial, 'updated_at', []),
+    'consumption': (DailyConsumption, 'created_at', []),
+    'products': (ProductType, 'updated_at', []),
+    'production': (DailyProduction, 'created_at', []),
+    'customers': (Customer, 'updated_at', []),
+    # Order counters move through queryset updates that do not touch updated_at
+    'orders': (PurchaseOrder, 'updated_at', ['total_ordered', 'total_fulfilled', 'item_count']),
+    # Items carry no timestamp; edits show up in the quantity sums
+    'order_items': (PurchaseOrderItem, None, ['quantity_ordered', 'quantity_fulfilled']),
+}
+
+def cache_root() -> Path:
+    return Path(settings.EXPORT_CACHE_ROOT)
+
+
+def _table_fingerprint(table: str, queryset, extra_sums=()) -> list:
+    """Row count, newest timestamp and counter sums of one table's rows in `queryset`."""
+    _, timestamp_field, summed_fields = TABLE_FINGERPRINTS[table]
+    aggregates = {'rows': Count('pk')}
+    if timestamp_field:
+        aggregates['latest'] = Max(timestamp_field)
+    aggregates.update({field: Sum(field) for field in [*summed_fields, *extra_sums]})
+    values = queryset.order_by().aggregate(**aggregates)
+    return [table] + [values[name] for name in aggregates]
+
+
+def data_fingerprint(tables) -> list:
+    """Row count, newest timestamp and counter sums for each of the given tables."""
+    return [_table_fingerprint(table, TABLE_FINGERPRINTS[table][0].objects.all()) for table in tables]
+
+
+def filtered_fingerprint(export_type: str, filters: dict = None) -> list:
+    """
+    Like data_fingerprint(), but the export's own table only counts the rows
+    its filters select, so rows outside a report's date window leave it
+    unchanged. Its quantity total is included to catch in-place edits. The
+    lookup tables the rows show names from are fingerprinted whole.
+    """
+    spec = EXPORT_REGISTRY[export_type]
+    table, *lookup_tables = spec.tables
+    extra_sums = [spec.quantity_field] if spec.quantity_field else []
+    return [_table_fingerprint(table, spec.filtered_queryset(filters), extra_sums)] + data_fingerprint(lookup_tables)
+
+
+def cache_key(export_type: str, export_format: str, filters: dict = None, tables=None, fingerprint=None) -> str:
+    """
+    Content-versioned key for an export; changes whenever its source data does.
+    `tables` defaults to the tables the registered export reads; `fingerprint`
+    replaces their data_fingerprint(), e.g. with filtered_fingerprint().
+    """
+    if fingerprint is None:
+        if tables is None:
+            tables = EXPORT_REGISTRY[export_type].tables
+        fingerprint = data_fingerprint(tables)
+    payload = json.dumps(
+        [export_type, export_format, sorted((filters or {}).items()), fingerprint],
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def cache_path(key: str, export_format: str) -> Path:
+    return cache_root() / f'{key}.{FILE_EXTENSIONS[export_format]}'
+
+
+def lookup(key: str, export_format: str):
+    """Return the cached file path, or None on a miss; a hit counts as a use for LRU."""
+    path = cache_path(key, export_format)
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    return path
+
+
+def _new_partial_file(key: str):
+    cache_root().mkdir(parents=True, exist_ok=True)
+    return NamedTemporaryFile(dir=cache_root(), prefix=f'{key}.', suffix='.part', delete=False)
+
+
+def store(key: str, export_format: str, write) -> Path:
+    """
+    Generate a file into the cache and return its path.
+
+    Args:
+        key: Cache key from cache_key()
+        export_format: One of FILE_EXTENSIONS
+        write: Callable that writes the export to the open binary file it is given
+    """
+    partial = _new_partial_file(key)
+    try:
+        with partial:
+            write(partial)
+        path = cache_path(key, export_format)
+        os.replace(partial.name, path)
+    except BaseException:
+        Path(partial.name).unlink(missing_ok=True)
+        raise
+    evict(keep=path)
+    return path
+
+
+def tee(key: str, export_format: str, chunks):
+    """Pass streamed chunks through while saving them; only complete streams are cached."""
+    partial = _new_partial_file(key)
+    completed = False
+    try:
+        with partial:
+            for chunk in chunks:
+                partial.write(chunk)
+                yield chunk
+        os.replace(partial.name, cache_path(key, export_format))
+        completed = True
+        evict(keep=cache_path(key, export_format))
+    finally:
+        if not completed:
+            Path(partial.name).unlink(missing_ok=True)
+
+
+def evict(keep: Path = None) -> int:
+    """Drop files older than the age limit, then least recently used ones over the size limit."""
+    max_age = settings.EXPORT_CACHE_MAX_AGE_HOURS * 3600
+    max_bytes = settings.EXPORT_CACHE_MAX_MB * 1024 * 1024
+    now = time.time()
+
+    entries = []
+    for path in cache_root().glob('*'):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    removed = 0
+    total = 0
+    survivors = []
+    for mtime, size, path in entries:
+        # Abandoned partial files are aged out like finished ones
+        if path != keep and now - mtime > max_age:
+            path.unlink(missing_ok=True)
+            removed += 1
+        else:
+            survivors.append((mtime, size, path))
+            total += size
+
+    for mtime, size, path in sorted(survivors, key=lambda entry: entry[0]):
+        if total <= max_bytes:
+            break
+        if path == keep or path.suffix == '.part':
+            continue
+        path.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    return removed
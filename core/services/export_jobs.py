@@ -0,0 +1,144 @@
+"""
+Background export jobs.
+
+Export requests are stored as ExportJob rows and return immediately;
+`manage.py run_export_worker` claims them one at a time, writes the file
+under EXPORT_ROOT with the regular export writers and records progress.
+"""
+import os
+from datetime import timedelta
+from pathlib import Path
+from django.conf import settings
+from django.utils import timezone
+
+from ..models import ExportJob
+from .export import FILE_EXTENSIONS, PARQUET_AVAILABLE, get_export_filename, write_export
+from .export_sources import EXPORT_REGISTRY
+
+# Progress is written back to the job row every this many rows
+PROGRESS_EVERY = 1000
+
+
+def enqueue_export(export_type: str, export_format: str, user=None, filters=None) -> ExportJob:
+    """
+    Queue an export; raises ValueError for unknown types, formats or filter values.
+
+    If the same user already has the same export queued or running, that job
+    is returned instead of queueing a duplicate.
+    """
+    if export_type not in EXPORT_REGISTRY:
+        raise ValueError(f'Unknown export type: {export_type}')
+    if export_format not in FILE_EXTENSIONS or not EXPORT_REGISTRY[export_type].supports(export_format):
+        raise ValueError(f'Unknown export format: {export_format}')
+    if export_format == 'parquet' and not PARQUET_AVAILABLE:
+        raise ValueError('Parquet exports require the pyarrow package on the server.')
+    job = dict(
+        export_type=export_type,
+        export_format=export_format,
+        filters=EXPORT_REGISTRY[export_type].filters_from(filters or {}),
+        created_by=user,
+    )
+    active = ExportJob.objects.filter(status__in=('queued', 'running'), **job).order_by('-created_at').first()
+    return active or ExportJob.objects.create(**job)
+
+
+def claim_next_job():
+    """Move the oldest queued job to running; returns None when the queue is empty."""
+    while True:
+        job_id = ExportJob.objects.filter(status='queued').order_by('created_at').values_list('id', flat=True).first()
+        if job_id is None:
+            return None
+        # Conditional update so two workers never claim the same job
+        claimed = ExportJob.objects.filter(pk=job_id, status='queued').update(
+            status='running', started_at=timezone.now()
+        )
+        if claimed:
+            return ExportJob.objects.get(pk=job_id)
+
+
+def export_path(job: ExportJob) -> Path:
+    """Location of a job's output file."""
+    return Path(settings.EXPORT_ROOT) / job.file_name
+
+
+def _counted_rows(job: ExportJob, rows):
+    """Pass rows through while recording progress on the job row."""
+    count = 0
+    for row in rows:
+        yield row
+        count += 1
+        if count % PROGRESS_EVERY == 0:
+            ExportJob.objects.filter(pk=job.pk).update(rows_processed=count)
+    job.rows_processed = count
+
+
+def run_export_job(job: ExportJob) -> ExportJob:
+    """Generate the file for a claimed job and mark it done or failed."""
+    partial_path = None
+    try:
+        source = EXPORT_REGISTRY[job.export_type].source_for(job.export_format, job.filters)
+        job.rows_total = source['queryset'].count()
+        ExportJob.objects.filter(pk=job.pk).update(rows_total=job.rows_total)
+
+        job.file_name = (
+            f'{get_export_filename(job.export_type, job.export_format)}_{str(job.id)[:8]}'
+            f'.{FILE_EXTENSIONS[job.export_format]}'
+        )
+        path = export_path(job)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial_path = path.with_name(path.name + '.part')
+
+        # Large PDFs are laid out on every core the worker has
+        pdf_workers = 1
+        if job.rows_total >= settings.EXPORT_PDF_PARALLEL_MIN_ROWS:
+            pdf_workers = settings.EXPORT_PDF_WORKERS
+
+        with open(partial_path, 'wb') as output:
+            write_export(
+                source, job.export_format, output,
+                rows=_counted_rows(job, source['rows']),
+                pdf_workers=pdf_workers,
+            )
+        os.replace(partial_path, path)
+    except Exception as e:
+        if partial_path is not None:
+            partial_path.unlink(missing_ok=True)
+        job.status = 'failed'
+        job.error = str(e)
+        job.finished_at = timezone.now()
+        job.save()
+        return job
+
+    job.status = 'done'
+    job.file_size = path.stat().st_size
+    job.finished_at = timezone.now()
+    job.expires_at = job.finished_at + timedelta(hours=settings.EXPORT_RETENTION_HOURS)
+    job.save()
+    return job
+
+
+def fail_stale_jobs() -> int:
+    """
+    Fail jobs left running longer than EXPORT_JOB_TIMEOUT_MINUTES.
+
+    A worker that was killed mid-export never marks its job finished; run at
+    worker start so such jobs stop showing as running. Returns how many failed.
+    """
+    cutoff = timezone.now() - timedelta(minutes=settings.EXPORT_JOB_TIMEOUT_MINUTES)
+    return ExportJob.objects.filter(status='running', started_at__lt=cutoff).update(
+        status='failed',
+        error='The export worker stopped before this export finished. Please request it again.',
+        finished_at=timezone.now(),
+    )
+
+
+def purge_expired_jobs() -> int:
+    """Delete files of finished jobs past their expiry; returns how many were purged."""
+    expired = ExportJob.objects.filter(status='done', expires_at__lte=timezone.now())
+    purged = 0
+    for job in expired:
+        export_path(job).unlink(missing_ok=True)
+        job.status = 'expired'
+        job.save(update_fields=['status'])
+        purged += 1
+    return purged
@@ -0,0 +1,62 @@
+"""
+Limits on heavy direct exports.
+
+Excel, PDF and Parquet downloads are generated inside a gunicorn worker, so a
+few large ones at once can tie up every worker and most of the memory on a
+small instance. Before generating, the row count is estimated with a COUNT
+on the filtered queryset; exports over the direct-download limit are sent to
+the background worker instead. The rest run under a slot semaphore of
+EXPORT_MAX_CONCURRENT lock files, which holds across threads and gunicorn
+worker processes on the same host and is released by the kernel if a worker
+dies mid-export.
+"""
+import fcntl
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from django.conf import settings
+
+LOCK_DIR_NAME = 'locks'
+
+
+class ExportBusy(Exception):
+    """Every heavy export slot is taken."""
+
+
+def direct_row_limit(export_format: str) -> int:
+    """Largest export that is generated inside the request for this format"""
+    if export_format == 'pdf':
+        return settings.EXPORT_DIRECT_MAX_PDF_ROWS
+    return settings.EXPORT_DIRECT_MAX_ROWS
+
+
+def estimate_rows(source: dict) -> int:
+    """Row count of an export source, from a COUNT on its filtered queryset"""
+    return source['queryset'].count()
+
+
+def _lock_dir() -> Path:
+    return Path(settings.EXPORT_ROOT) / LOCK_DIR_NAME
+
+
+@contextmanager
+def heavy_export_slot():
+    """
+    Hold one of EXPORT_MAX_CONCURRENT export slots for the duration of the
+    block; raises ExportBusy immediately if none is free.
+    """
+    _lock_dir().mkdir(parents=True, exist_ok=True)
+    for slot in range(settings.EXPORT_MAX_CONCURRENT):
+        fd = os.open(_lock_dir() / f'export-slot-{slot}.lock', os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            continue
+        try:
+            yield slot
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+        return
+    raise ExportBusy('All export slots are in use')
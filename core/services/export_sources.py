@@ -0,0 +1,462 @@
+"""
+Export registry.
+
+Each module's export is declared once as an ExportSpec: its columns, the
+`values_list()` projection that feeds them, per-column display mappings,
+the list-page filters it accepts and the summary. Summaries (row count, date
+range, quantity totals and breakdowns) come from one aggregate query, not a
+pass over the rows. Fact tables also declare
+typed columns for Parquet exports. `ExportSpec.source()` turns a spec into a row source (title,
+headers, a lazy row iterator, the underlying queryset for counting and a
+summary callable); the Excel, PDF, CSV and background-job writers all
+consume that shape. Rows are plain tuples from the database cursor, so no
+model instances or per-row dicts are built.
+"""
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal
+from django.db.models import Case, Count, F, FloatField, Max, Min, Sum, Value, When
+from django.db.models.functions import Cast
+from django.utils.dateparse import parse_date
+
+from ..models import (
+    RawMaterial, DailyConsumption, ProductType, DailyProduction, Customer, PurchaseOrder, PurchaseOrderItem
+)
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+def _choices(choices):
+    """Display mapping for a choices field"""
+    labels = dict(choices)
+    return lambda value: labels.get(value, value)
+
+
+def _blank(value):
+    return value or ''
+
+
+def _date(value):
+    return value.date() if value else ''
+
+
+def _po_number(value):
+    return f'PO-{str(value)[:8].upper()}'
+
+
+def _percent(value):
+    return f'{value:.0f}%'
+
+
+def _quantity(value):
+    return f'{value:,.2f}' if isinstance(value, Decimal) else f'{value:,}'
+
+
+def _valid_date(value):
+    """Date filters must be YYYY-MM-DD; parse_date itself raises ValueError for impossible dates"""
+    if parse_date(value) is None:
+        raise ValueError
+    return value
+
+
+def _valid_uuid(value):
+    return str(uuid.UUID(value))
+
+
+@dataclass(frozen=True)
+class ExportColumn:
+    """One exported column: its header, the projected field and an optional display mapping"""
+    header: str
+    field: str
+    display: object = None
+
+
+@dataclass(frozen=True)
+class FactColumn:
+    """A typed column of a Parquet fact export (see export_to_parquet for kinds)"""
+    name: str
+    field: str
+    kind: str
+    precision: tuple = None
+    display: object = None
+
+
+@dataclass(frozen=True)
+class SummaryBreakdown:
+    """Summary quantity totals per value of a field, e.g. per category"""
+    label: str
+    field: str
+    display: object = None
+
+
+@dataclass(frozen=True)
+class ExportFilter:
+    """A list-page query parameter applied to the export in SQL"""
+    param: str
+    lookup: str
+    label: str
+    display: object = None
+    parse: object = None  # Normalizes the raw parameter; raises ValueError when it is invalid
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    """Declarative description of a module export"""
+    label: str
+    title: str
+    sheet_name: str
+    queryset: object  # Callable returning the base queryset (annotations included)
+    columns: tuple
+    ordering: tuple
+    tables: tuple  # Tables the export reads, for cache fingerprints
+    count_label: str = 'Total Records'
+    date_range_field: str = None
+    filters: tuple = ()
+    facts: tuple = ()  # FactColumns; Parquet is offered when present
+    quantity_field: str = None  # Totalled in the summary
+    unit_field: str = None  # Quantities are totalled per unit when set
+    breakdowns: tuple = ()  # SummaryBreakdowns of the quantity total
+
+    @property
+    def headers(self):
+        return [column.header for column in self.columns]
+
+    def supports(self, export_format: str) -> bool:
+        return export_format != 'parquet' or bool(self.facts)
+
+    def filters_from(self, params) -> dict:
+        """
+        The non-empty filter parameters this export accepts, e.g. from request.GET.
+
+        Raises ValueError for a value its filter cannot parse, so bad input is
+        rejected before it reaches a query or is stored on an ExportJob.
+        """
+        filters = {}
+        for export_filter in self.filters:
+            value = params.get(export_filter.param)
+            if not value:
+                continue
+            if export_filter.parse:
+                try:
+                    value = export_filter.parse(value)
+                except ValueError:
+                    raise ValueError(f'Invalid {export_filter.param} filter: {value}')
+            filters[export_filter.param] = value
+        return filters
+
+    def filtered_queryset(self, filters=None):
+        filters = filters or {}
+        return self.queryset().filter(**{
+            export_filter.lookup: filters[export_filter.param]
+            for export_filter in self.filters
+            if export_filter.param in filters
+        })
+
+    def projected_queryset(self, filters=None):
+        """The filtered, ordered `values_list()` query behind the rows"""
+        return self.filtered_queryset(filters).order_by(*self.ordering).values_list(
+            *[column.field for column in self.columns]
+        )
+
+    def describe_filters(self, filters) -> dict:
+        """Summary lines for the filters in effect"""
+        return {
+            export_filter.label: (
+                export_filter.display(filters[export_filter.param])
+                if export_filter.display else filters[export_filter.param]
+            )
+            for export_filter in self.filters
+            if export_filter.param in filters
+        }
+
+    def _quantity_total(self, groups):
+        """Sum of the summary quantity over aggregate groups, per unit when the spec has one"""
+        if not self.unit_field:
+            return sum(group['summary_quantity'] or 0 for group in groups)
+        per_unit = {}
+        for group in groups:
+            unit = group[self.unit_field]
+            per_unit[unit] = per_unit.get(unit, 0) + (group['summary_quantity'] or 0)
+        return ', '.join(f'{_quantity(total)} {unit}' for unit, total in sorted(per_unit.items())) or '0'
+
+    def summary(self, filters=None) -> dict:
+        """
+        Summary block from one aggregate query: row count, date range, total
+        quantity and its breakdowns, then the filters in effect.
+        """
+        filters = filters or {}
+        aggregates = {'summary_rows': Count('pk')}
+        if self.date_range_field:
+            aggregates['summary_first'] = Min(self.date_range_field)
+            aggregates['summary_last'] = Max(self.date_range_field)
+        if self.quantity_field:
+            aggregates['summary_quantity'] = Sum(self.quantity_field)
+
+        queryset = self.filtered_queryset(filters).order_by()
+        group_fields = list(dict.fromkeys(
+            ([self.unit_field] if self.unit_field else []) + [breakdown.field for breakdown in self.breakdowns]
+        ))
+        if self.quantity_field and group_fields:
+            # One row per unit/breakdown combination; every total is rolled up from these
+            groups = list(queryset.values(*group_fields).annotate(**aggregates))
+        else:
+            groups = [queryset.aggregate(**aggregates)]
+
+        result = {self.count_label: sum(group['summary_rows'] for group in groups)}
+        if self.date_range_field:
+            firsts = [group['summary_first'] for group in groups if group['summary_first'] is not None]
+            lasts = [group['summary_last'] for group in groups if group['summary_last'] is not None]
+            result['Date Range'] = f'{min(firsts) if firsts else "N/A"} to {max(lasts) if lasts else "N/A"}'
+        if self.quantity_field:
+            result['Total Quantity'] = self._quantity_total(groups)
+            for breakdown in self.breakdowns:
+                by_value = {}
+                for group in groups:
+                    value = group[breakdown.field]
+                    label = breakdown.display(value) if breakdown.display else value
+                    by_value.setdefault(str(label), []).append(group)
+                for label, value_groups in sorted(by_value.items()):
+                    result[f'{breakdown.label}: {label}'] = self._quantity_total(value_groups)
+        result.update(self.describe_filters(filters))
+        return result
+
+    def source(self, filters=None) -> dict:
+        """Build a row source; nothing is queried until the rows are consumed."""
+        filters = filters or {}
+        queryset = self.projected_queryset(filters)
+        converters = [(index, column.display) for index, column in enumerate(self.columns) if column.display]
+
+        def rows():
+            for row in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+                if converters:
+                    row = list(row)
+                    for index, display in converters:
+                        row[index] = display(row[index])
+                yield row
+
+        return {
+            'title': self.title,
+            'sheet_name': self.sheet_name,
+            'headers': self.headers,
+            'rows': rows(),
+            'queryset': queryset,
+            'summary': lambda: self.summary(filters),
+        }
+
+    def fact_source(self, filters=None) -> dict:
+        """Row source of typed fact columns in (date, created_at, id) order, for Parquet."""
+        queryset = self.filtered_queryset(filters).order_by('date', 'created_at', 'id').values_list(
+            *[column.field for column in self.facts]
+        )
+        converters = [(index, column.display) for index, column in enumerate(self.facts) if column.display]
+
+        def rows():
+            for row in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+                if converters:
+                    row = list(row)
+                    for index, display in converters:
+                        row[index] = display(row[index])
+                yield row
+
+        return {
+            'title': self.title,
+            'sheet_name': self.sheet_name,
+            'headers': [column.name for column in self.facts],
+            'schema': [(column.name, column.kind, column.precision) for column in self.facts],
+            'rows': rows(),
+            'queryset': queryset,
+            'summary': lambda: {},
+        }
+
+    def source_for(self, export_format: str, filters=None) -> dict:
+        """The row source a writer of `export_format` consumes"""
+        if export_format == 'parquet':
+            return self.fact_source(filters)
+        return self.source(filters)
+
+
+def _name_of(model):
+    """Filter display that shows the selected object's name"""
+    def display(pk):
+        return model.objects.filter(pk=pk).values_list('name', flat=True).first() or pk
+    return display
+
+
+def _date_range_filters(field):
+    """date_from/date_to filters on a date lookup, validated as YYYY-MM-DD"""
+    return (
+        ExportFilter('date_from', f'{field}__gte', 'From', parse=_valid_date),
+        ExportFilter('date_to', f'{field}__lte', 'To', parse=_valid_date),
+    )
+
+
+def _object_filter(param, lookup, label, model):
+    """Filter on a related object's id, validated as a UUID and shown by name"""
+    return ExportFilter(param, lookup, label, _name_of(model), _valid_uuid)
+
+
+def _orders_queryset():
+    return PurchaseOrder.objects.annotate(
+        progress_percent=Case(
+            When(total_ordered=0, then=Value(0.0)),
+            default=Cast(F('total_fulfilled'), FloatField()) * 100 / F('total_ordered'),
+            output_field=FloatField(),
+        )
+    )
+
+
+EXPORT_REGISTRY = {
+    'raw_materials': ExportSpec(
+        label='Raw Materials',
+        title='Raw Materials Library',
+        sheet_name='Raw Materials',
+        queryset=RawMaterial.objects.all,
+        columns=(
+            ExportColumn('Name', 'name'),
+            ExportColumn('Category', 'category', _choices(RawMaterial.CATEGORY_CHOICES)),
+            ExportColumn('Unit', 'unit'),
+        ),
+        ordering=('category', 'name'),
+        tables=('raw_materials',),
+        filters=(ExportFilter('category', 'category', 'Category', _choices(RawMaterial.CATEGORY_CHOICES)),),
+        count_label='Total Materials',
+    ),
+    'consumption': ExportSpec(
+        label='Consumption History',
+        title='Consumption History',
+        sheet_name='Consumption',
+        queryset=DailyConsumption.objects.all,
+        columns=(
+            ExportColumn('Date', 'date'),
+            ExportColumn('Material', 'raw_material__name'),
+            ExportColumn('Category', 'raw_material__category', _choices(RawMaterial.CATEGORY_CHOICES)),
+            ExportColumn('Quantity', 'quantity'),
+            ExportColumn('Unit', 'raw_material__unit'),
+        ),
+        ordering=('-date',),
+        tables=('consumption', 'raw_materials'),
+        date_range_field='date',
+        quantity_field='quantity',
+        unit_field='raw_material__unit',
+        breakdowns=(
+            SummaryBreakdown('Category', 'raw_material__category', _choices(RawMaterial.CATEGORY_CHOICES)),
+            SummaryBreakdown('Material', 'raw_material__name'),
+        ),
+        facts=(
+            FactColumn('date', 'date', 'date'),
+            FactColumn('raw_material_id', 'raw_material_id', 'string', display=str),
+            FactColumn('material', 'raw_material__name', 'string'),
+            FactColumn('category', 'raw_material__category', 'category',
+                       display=_choices(RawMaterial.CATEGORY_CHOICES)),
+            FactColumn('unit', 'raw_material__unit', 'category'),
+            FactColumn('quantity', 'quantity', 'decimal', precision=(10, 2)),
+            FactColumn('recorded_at', 'created_at', 'timestamp'),
+        ),
+        filters=_date_range_filters('date') + (
+            ExportFilter('category', 'raw_material__category', 'Category', _choices(RawMaterial.CATEGORY_CHOICES)),
+        ),
+    ),
+    'products': ExportSpec(
+        label='Product Types',
+        title='Product Types',
+        sheet_name='Products',
+        queryset=ProductType.objects.all,
+        columns=(
+            ExportColumn('Name', 'name'),
+            ExportColumn('Description', 'description', _blank),
+        ),
+        ordering=('name',),
+        tables=('products',),
+        count_label='Total Products',
+    ),
+    'production': ExportSpec(
+        label='Production History',
+        title='Production History',
+        sheet_name='Production',
+        queryset=DailyProduction.objects.all,
+        columns=(
+            ExportColumn('Date', 'date'),
+            ExportColumn('Product', 'product_type__name'),
+            ExportColumn('Quantity', 'quantity'),
+            ExportColumn('Contents', 'contents_description', _blank),
+        ),
+        ordering=('-date',),
+        tables=('production', 'products'),
+        date_range_field='date',
+        quantity_field='quantity',
+        breakdowns=(SummaryBreakdown('Product', 'product_type__name'),),
+        facts=(
+            FactColumn('date', 'date', 'date'),
+            FactColumn('product_type_id', 'product_type_id', 'string', display=str),
+            FactColumn('product', 'product_type__name', 'category'),
+            FactColumn('quantity', 'quantity', 'integer'),
+            FactColumn('contents', 'contents_description', 'string'),
+            FactColumn('recorded_at', 'created_at', 'timestamp'),
+        ),
+        filters=_date_range_filters('date') + (_object_filter('product', 'product_type_id', 'Product', ProductType),),
+    ),
+    'customers': ExportSpec(
+        label='Customers',
+        title='Customers',
+        sheet_name='Customers',
+        queryset=Customer.objects.with_order_stats,
+        columns=(
+            ExportColumn('Name', 'name'),
+            ExportColumn('Contact', 'contact_info', _blank),
+            ExportColumn('Orders', 'order_count'),
+            ExportColumn('Units Ordered', 'units_ordered'),
+            ExportColumn('Last Order', 'last_order_at', _date),
+        ),
+        ordering=('name',),
+        tables=('customers', 'orders'),
+        count_label='Total Customers',
+        filters=(ExportFilter('search', 'name__icontains', 'Search'),),
+    ),
+    'orders': ExportSpec(
+        label='Purchase Orders',
+        title='Purchase Orders',
+        sheet_name='Orders',
+        queryset=_orders_queryset,
+        columns=(
+            ExportColumn('PO Number', 'id', _po_number),
+            ExportColumn('Customer', 'customer__name'),
+            ExportColumn('Status', 'status', _choices(PurchaseOrder.STATUS_CHOICES)),
+            ExportColumn('Items', 'item_count'),
+            ExportColumn('Progress', 'progress_percent', _percent),
+            ExportColumn('Created', 'created_at', _date),
+        ),
+        ordering=('-created_at',),
+        tables=('orders', 'customers'),
+        count_label='Total Orders',
+        filters=(
+            ExportFilter('status', 'status', 'Status', _choices(PurchaseOrder.STATUS_CHOICES)),
+            _object_filter('customer', 'customer_id', 'Customer', Customer),
+        ) + _date_range_filters('created_at__date'),
+    ),
+    'order_items': ExportSpec(
+        label='Order Items',
+        title='Purchase Order Items',
+        sheet_name='Order Items',
+        queryset=PurchaseOrderItem.objects.all,
+        columns=(
+            ExportColumn('PO Number', 'purchase_order_id', _po_number),
+            ExportColumn('Customer', 'purchase_order__customer__name'),
+            ExportColumn('Status', 'purchase_order__status', _choices(PurchaseOrder.STATUS_CHOICES)),
+            ExportColumn('Product', 'product_type__name'),
+            ExportColumn('Ordered', 'quantity_ordered'),
+            ExportColumn('Fulfilled', 'quantity_fulfilled'),
+            ExportColumn('Created', 'purchase_order__created_at', _date),
+        ),
+        ordering=('-purchase_order__created_at', 'purchase_order_id', 'product_type__name'),
+        tables=('order_items', 'orders', 'customers', 'products'),
+        count_label='Total Items',
+        quantity_field='quantity_ordered',
+        breakdowns=(SummaryBreakdown('Product', 'product_type__name'),),
+        filters=(
+            ExportFilter('status', 'purchase_order__status', 'Status', _choices(PurchaseOrder.STATUS_CHOICES)),
+            _object_filter('customer', 'purchase_order__customer_id', 'Customer', Customer),
+        ) + _date_range_filters('purchase_order__created_at__date'),
+    ),
+}
+
+EXPORT_LABELS = {name: spec.label for name, spec in EXPORT_REGISTRY.items()}
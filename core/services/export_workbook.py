@@ -0,0 +1,49 @@
+"""
+Full workbook export.
+
+Month-end closing needs every module in one file that agrees with itself, so
+all sheets are read inside a single read-only transaction: REPEATABLE READ
+on PostgreSQL, where every query sees the same snapshot and `.iterator()`
+streams through server-side cursors. SQLite transactions read a single
+snapshot already.
+"""
+from contextlib import contextmanager
+from django.db import connection, transaction
+
+from .export import export_to_excel_workbook
+from .export_sources import EXPORT_REGISTRY
+
+WORKBOOK_EXPORT = 'workbook'
+
+# Sheets in workbook order
+WORKBOOK_SHEETS = (
+    'raw_materials', 'consumption', 'products', 'production', 'customers', 'orders', 'order_items',
+)
+
+# Every table the workbook reads, for export cache fingerprints
+WORKBOOK_TABLES = tuple(dict.fromkeys(
+    table for export_type in WORKBOOK_SHEETS for table in EXPORT_REGISTRY[export_type].tables
+))
+
+
+@contextmanager
+def consistent_snapshot():
+    """
+    Read-only transaction in which every query sees the same committed data.
+    Must be the outermost transaction, since the isolation level can only be
+    set before its first query.
+    """
+    with transaction.atomic(durable=True):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY')
+        yield
+
+
+def write_full_workbook(output):
+    """Write one sheet per module to `output`, in one pass over each table."""
+    with consistent_snapshot():
+        return export_to_excel_workbook(
+            (EXPORT_REGISTRY[export_type].source() for export_type in WORKBOOK_SHEETS),
+            output=output,
+        )
@@ -0,0 +1,138 @@
+"""
+Raw-material demand forecast.
+
+Daily usage of every raw material over the last HISTORY_DAYS is loaded from
+the DailyMaterialUsage rollup in one query into a (materials x days) NumPy
+matrix, and three models run on the whole matrix at once:
+
+- moving average of the last week,
+- simple exponential smoothing, as one weighted sum over the history,
+- weekday-seasonal: the mean of each weekday over the history.
+
+Each material gets the model with the smallest error on the last week when
+fitted on the weeks before it. The next HORIZON_DAYS are cached for
+FORECAST_CACHE_SECONDS; saving or deleting a consumption entry or material
+drops the cached copy sooner (see core/signals.py). The timeout bounds how
+stale other processes can be, since each has its own local-memory cache.
+"""
+from datetime import timedelta
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from ..models import DailyMaterialUsage, RawMaterial
+
+FORECAST_CACHE_KEY = 'core:forecast:snapshot'
+
+HISTORY_DAYS = 56  # Whole weeks, so weekday columns line up
+HORIZON_DAYS = 7
+MOVING_AVERAGE_DAYS = 7
+SMOOTHING_ALPHA = 0.3
+BACKTEST_DAYS = 7
+
+MODELS = ('moving_average', 'exponential_smoothing', 'weekday_seasonal')
+MODEL_LABELS = {
+    'moving_average': '7-day average',
+    'exponential_smoothing': 'Exponential smoothing',
+    'weekday_seasonal': 'Weekday pattern',
+}
+
+
+def load_usage_matrix(materials: list, start, days: int) -> np.ndarray:
+    """Daily usage as a (len(materials), days) float matrix, zero where nothing was logged."""
+    usage = np.zeros((len(materials), days))
+    rows = DailyMaterialUsage.objects.filter(
+        date__gte=start, date__lt=start + timedelta(days=days)
+    ).values_list('raw_material_id', 'date', 'total_quantity')
+
+    material_index = {material['id']: index for index, material in enumerate(materials)}
+    positions = [
+        (material_index[material_id], (day - start).days, quantity)
+        for material_id, day, quantity in rows
+        if material_id in material_index  # Materials added since the list was read
+    ]
+    if positions:
+        material_rows, day_columns, quantities = zip(*positions)
+        usage[list(material_rows), list(day_columns)] = np.asarray(quantities, dtype=float)
+    return usage
+
+
+def predict(history: np.ndarray, horizon: int) -> np.ndarray:
+    """
+    Forecast every row of `history` with every model.
+
+    Returns a (len(MODELS), rows, horizon) array. The history length must be
+    a whole number of weeks.
+    """
+    rows, days = history.shape
+
+    moving_average = history[:, -MOVING_AVERAGE_DAYS:].mean(axis=1)
+
+    # Level after smoothing day by day, as one weighted sum: the first day seeds the level
+    ages = np.arange(days - 1, -1, -1)
+    weights = SMOOTHING_ALPHA * (1 - SMOOTHING_ALPHA) ** ages
+    weights[0] = (1 - SMOOTHING_ALPHA) ** (days - 1)
+    smoothed = history @ weights
+
+    # Column j of the weekly profile is the weekday of history day j (mod 7)
+    weekly_profile = history.reshape(rows, days // 7, 7).mean(axis=1)
+    seasonal = weekly_profile[:, (days + np.arange(horizon)) % 7]
+
+    flat = np.stack([moving_average, smoothed])[:, :, np.newaxis].repeat(horizon, axis=2)
+    return np.concatenate([flat, seasonal[np.newaxis]])
+
+
+def choose_models(history: np.ndarray) -> np.ndarray:
+    """Index into MODELS of the model with the lowest error on the last week, per row."""
+    fitted = predict(history[:, :-BACKTEST_DAYS], BACKTEST_DAYS)
+    errors = np.abs(fitted - history[np.newaxis, :, -BACKTEST_DAYS:]).mean(axis=2)
+    return errors.argmin(axis=0)
+
+
+def compute_forecast(today=None) -> dict:
+    """Forecast the next HORIZON_DAYS of usage for every raw material from history through yesterday."""
+    today = today or timezone.localdate()
+    start = today - timedelta(days=HISTORY_DAYS)
+    materials = list(RawMaterial.objects.order_by('category', 'name').values('id', 'name', 'unit', 'category'))
+    dates = [today + timedelta(days=offset) for offset in range(1, HORIZON_DAYS + 1)]
+    if not materials:
+        return {'today': today, 'dates': dates, 'rows': []}
+
+    history = load_usage_matrix(materials, start, HISTORY_DAYS)
+    # Tomorrow is day HISTORY_DAYS + 1 after the start, so predict today as well and drop it
+    forecasts = predict(history, HORIZON_DAYS + 1)[:, :, 1:]
+    chosen = choose_models(history)
+    best = forecasts[chosen, np.arange(len(materials))].round(2)
+    categories = dict(RawMaterial.CATEGORY_CHOICES)
+
+    return {
+        'today': today,
+        'dates': dates,
+        'rows': [
+            {
+                'material': material['name'],
+                'unit': material['unit'],
+                'category': categories.get(material['category'], material['category']),
+                'model': MODEL_LABELS[MODELS[model]],
+                'forecast': values.tolist(),
+                'total': round(float(values.sum()), 2),
+            }
+            for material, model, values in zip(materials, chosen, best)
+        ],
+    }
+
+
+def get_forecast() -> dict:
+    """Return the cached forecast, recomputing it when missing or from another day."""
+    today = timezone.localdate()
+    forecast = cache.get(FORECAST_CACHE_KEY)
+    if forecast is None or forecast['today'] != today:
+        forecast = compute_forecast(today)
+        cache.set(FORECAST_CACHE_KEY, forecast, settings.FORECAST_CACHE_SECONDS)
+    return forecast
+
+
+def invalidate_forecast(**kwargs):
+    """Drop the cached forecast; usable directly as a signal receiver."""
+    cache.delete(FORECAST_CACHE_KEY)
@@ -0,0 +1,78 @@
+"""
+Material requirements planning.
+
+Open order demand is summed in SQL into one row per (order date, product),
+loaded into a days x products matrix, and multiplied by the products x
+materials recipe matrix, so the raw materials needed for the whole backlog
+come from two queries and one matrix product however many orders are open.
+Orders carry no due date, so requirements are bucketed by order date.
+"""
+import numpy as np
+from django.db.models import F, Sum
+from django.db.models.functions import TruncDate
+
+from ..models import PurchaseOrderItem, RecipeComponent
+
+OPEN_STATUSES = ('pending', 'in_progress')
+
+
+def open_demand():
+    """Remaining units per (order date, product) over open orders, in one grouped query"""
+    return (
+        PurchaseOrderItem.objects
+        .filter(purchase_order__status__in=OPEN_STATUSES, quantity_fulfilled__lt=F('quantity_ordered'))
+        .annotate(day=TruncDate('purchase_order__created_at'))
+        .values('day', 'product_type_id', 'product_type__name')
+        .annotate(remaining=Sum(F('quantity_ordered') - F('quantity_fulfilled')))
+        .order_by('day')
+    )
+
+
+def compute_requirements() -> dict:
+    """
+    Raw materials needed to fill the open backlog, per order date.
+
+    Returns the materials (name, unit), one (day, quantities) row per order
+    date in material order, the total per material, and the remaining units
+    of products that have no recipe and so are not counted.
+    """
+    demand_rows = list(open_demand())
+    days = sorted({row['day'] for row in demand_rows})
+    products = list(dict.fromkeys(row['product_type_id'] for row in demand_rows))
+
+    components = list(
+        RecipeComponent.objects.filter(product_type_id__in=products)
+        .order_by('raw_material__category', 'raw_material__name')
+        .values_list('product_type_id', 'raw_material_id', 'raw_material__name', 'raw_material__unit',
+                     'quantity_per_unit')
+    )
+    materials = list(dict.fromkeys(
+        (material_id, name, unit) for _, material_id, name, unit, _ in components
+    ))
+
+    day_index = {day: index for index, day in enumerate(days)}
+    product_index = {product_id: index for index, product_id in enumerate(products)}
+    material_index = {material[0]: index for index, material in enumerate(materials)}
+
+    demand = np.zeros((len(days), len(products)))
+    for row in demand_rows:
+        demand[day_index[row['day']], product_index[row['product_type_id']]] = row['remaining']
+
+    recipes = np.zeros((len(products), len(materials)))
+    for product_id, material_id, _, _, quantity in components:
+        recipes[product_index[product_id], material_index[material_id]] = quantity
+
+    requirements = (demand @ recipes).round(2)
+
+    with_recipe = {product_id for product_id, *_ in components}
+    missing = {}
+    for row in demand_rows:
+        if row['product_type_id'] not in with_recipe:
+            missing[row['product_type__name']] = missing.get(row['product_type__name'], 0) + row['remaining']
+
+    return {
+        'materials': [(name, unit) for _, name, unit in materials],
+        'rows': [(day, values.tolist()) for day, values in zip(days, requirements)],
+        'totals': requirements.sum(axis=0).round(2).tolist(),
+        'missing_recipes': sorted(missing.items()),
+    }
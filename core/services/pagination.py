@@ -0,0 +1,137 @@
+"""
+Keyset (cursor) pagination for history lists.
+
+Pages are addressed by the sort key of the last row shown rather than an
+OFFSET, so page 200 costs the same index range scan as page 1.
+"""
+import base64
+import json
+from dataclasses import dataclass
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import QueryDict
+
+DEFAULT_PAGE_SIZE = 50
+
+
+@dataclass
+class KeysetPage:
+    """One page of results plus opaque cursors for its neighbours."""
+    object_list: list
+    query_params: QueryDict
+    next_cursor: str = None
+    prev_cursor: str = None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.prev_cursor is not None
+
+    def _querystring(self, cursor):
+        params = self.query_params.copy()
+        params['cursor'] = cursor
+        return params.urlencode()
+
+    @property
+    def next_querystring(self):
+        return self._querystring(self.next_cursor) if self.has_next else ''
+
+    @property
+    def previous_querystring(self):
+        return self._querystring(self.prev_cursor) if self.has_previous else ''
+
+
+def encode_cursor(values: list, direction: str) -> str:
+    """Pack sort-key values into a URL-safe opaque token."""
+    payload = json.dumps({'k': [str(v) for v in values], 'd': direction})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, model, keys: tuple):
+    """Unpack a cursor into typed key values; returns (None, 'next') when invalid."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        raw_values, direction = payload['k'], payload['d']
+        if len(raw_values) != len(keys) or direction not in ('next', 'prev'):
+            raise ValueError
+        values = [model._meta.get_field(key).to_python(raw) for key, raw in zip(keys, raw_values)]
+    except (ValueError, TypeError, KeyError, ValidationError):
+        return None, 'next'
+    return values, direction
+
+
+def _keyset_filter(keys: tuple, values: list, lookup: str) -> Q:
+    """
+    Build (k1, k2, ...) < (v1, v2, ...) as an OR of prefix equalities.
+
+    The OR is ANDed with a plain range on the leading key (k1 <= v1), which
+    is implied by it but gives the planner an index seek instead of a scan
+    of the whole index from the top.
+    """
+    clauses = []
+    for idx, key in enumerate(keys):
+        equal_prefix = {k: v for k, v in zip(keys[:idx], values[:idx])}
+        clauses.append(Q(**equal_prefix, **{f'{key}__{lookup}': values[idx]}))
+    return Q(**{f'{keys[0]}__{lookup}e': values[0]}) & reduce(or_, clauses)
+
+
+def paginate_keyset(queryset, request, keys=('date', 'created_at', 'id'), per_page=DEFAULT_PAGE_SIZE) -> KeysetPage:
+    """
+    Return one newest-first page of queryset ordered by keys.
+
+    Args:
+        queryset: Filtered queryset to page through
+        request: Current request; its GET params are carried into the cursor links
+        keys: Sort key fields, most significant first; the last must be unique
+        per_page: Rows per page
+
+    Returns:
+        KeysetPage with the rows and next/previous cursors
+    """
+    cursor = request.GET.get('cursor', '')
+    values, direction = decode_cursor(cursor, queryset.model, keys) if cursor else (None, 'next')
+
+    descending = [f'-{key}' for key in keys]
+    ascending = list(keys)
+
+    if values is None:
+        rows = list(queryset.order_by(*descending)[:per_page + 1])
+        has_more_after, has_more_before = len(rows) > per_page, False
+        rows = rows[:per_page]
+    elif direction == 'next':
+        rows = list(queryset.filter(_keyset_filter(keys, values, 'lt')).order_by(*descending)[:per_page + 1])
+        has_more_after, has_more_before = len(rows) > per_page, True
+        rows = rows[:per_page]
+    else:
+        rows = list(queryset.filter(_keyset_filter(keys, values, 'gt')).order_by(*ascending)[:per_page + 1])
+        has_more_after, has_more_before = True, len(rows) > per_page
+        rows = rows[:per_page][::-1]
+
+    def key_of(row):
+        return [getattr(row, key) for key in keys]
+
+    params = request.GET.copy()
+    params.pop('cursor', None)
+
+    return KeysetPage(
+        object_list=rows,
+        next_cursor=encode_cursor(key_of(rows[-1]), 'next') if rows and has_more_after else None,
+        prev_cursor=encode_cursor(key_of(rows[0]), 'prev') if rows and has_more_before else None,
+        query_params=params,
+    )
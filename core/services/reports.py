@@ -0,0 +1,136 @@
+"""
+Pre-generated standard reports.
+
+`manage.py generate_reports` renders the daily, weekly and monthly
+consumption and production reports into REPORTS_ROOT with the regular
+export writers, so the morning rush downloads finished files. A manifest
+records each report's key (date window plus a fingerprint of only the rows in
+that window); reports whose key has not changed since the last run are
+skipped, so new entries for today do not re-render last month's report.
+"""
+import json
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from django.conf import settings
+from django.utils import timezone
+
+from .export import FILE_EXTENSIONS, write_export
+from .export_cache import cache_key, filtered_fingerprint
+from .export_sources import EXPORT_REGISTRY
+
+REPORT_TYPES = ('consumption', 'production')
+REPORT_PERIODS = ('daily', 'weekly', 'monthly')
+REPORT_FORMATS = ('excel', 'pdf')
+MANIFEST_NAME = 'manifest.json'
+
+
+@dataclass(frozen=True)
+class ReportPeriod:
+    name: str
+    date_from: object
+    date_to: object
+
+
+def report_periods(today=None) -> list:
+    """Yesterday, the 7 days ending yesterday, and yesterday's month to date"""
+    today = today or timezone.localdate()
+    yesterday = today - timedelta(days=1)
+    return [
+        ReportPeriod('daily', yesterday, yesterday),
+        ReportPeriod('weekly', yesterday - timedelta(days=6), yesterday),
+        ReportPeriod('monthly', yesterday.replace(day=1), yesterday),
+    ]
+
+
+def reports_root() -> Path:
+    return Path(settings.REPORTS_ROOT)
+
+
+def report_file_name(export_type: str, period: str, export_format: str) -> str:
+    return f'{export_type}-{period}.{FILE_EXTENSIONS[export_format]}'
+
+
+def load_manifest() -> dict:
+    try:
+        with open(reports_root() / MANIFEST_NAME) as manifest_file:
+            return json.load(manifest_file)
+    except FileNotFoundError:
+        return {}
+
+
+def _save_manifest(manifest: dict):
+    path = reports_root() / MANIFEST_NAME
+    partial_path = path.with_name(path.name + '.part')
+    with open(partial_path, 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    os.replace(partial_path, path)
+
+
+def generate_reports(today=None, force: bool = False):
+    """
+    Render every standard report whose data changed since the last run.
+
+    Yields (file name, rendered) pairs as it goes.
+    """
+    reports_root().mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest()
+
+    for period in report_periods(today):
+        filters = {'date_from': period.date_from.isoformat(), 'date_to': period.date_to.isoformat()}
+        for export_type in REPORT_TYPES:
+            spec = EXPORT_REGISTRY[export_type]
+            fingerprint = filtered_fingerprint(export_type, filters)
+            for export_format in REPORT_FORMATS:
+                file_name = report_file_name(export_type, period.name, export_format)
+                path = reports_root() / file_name
+                key = cache_key(export_type, export_format, filters, fingerprint=fingerprint)
+
+                if not force and path.exists() and manifest.get(file_name, {}).get('key') == key:
+                    yield file_name, False
+                    continue
+
+                partial_path = path.with_name(path.name + '.part')
+                try:
+                    with open(partial_path, 'wb') as output:
+                        write_export(spec.source(filters), export_format, output)
+                    os.replace(partial_path, path)
+                finally:
+                    partial_path.unlink(missing_ok=True)
+
+                manifest[file_name] = {
+                    'key': key,
+                    'export_type': export_type,
+                    'export_format': export_format,
+                    'period': period.name,
+                    'date_from': filters['date_from'],
+                    'date_to': filters['date_to'],
+                    'generated_at': timezone.now().isoformat(),
+                    'size': path.stat().st_size,
+                }
+                _save_manifest(manifest)
+                yield file_name, True
+
+
+def list_reports() -> list:
+    """Generated reports grouped per report, for the Reports page"""
+    manifest = load_manifest()
+    reports = []
+    for period in REPORT_PERIODS:
+        for export_type in REPORT_TYPES:
+            files = []
+            for export_format in REPORT_FORMATS:
+                file_name = report_file_name(export_type, period, export_format)
+                entry = manifest.get(file_name)
+                if entry and (reports_root() / file_name).exists():
+                    files.append({'file_name': file_name, **entry})
+            if files:
+                reports.append({
+                    'label': f'{period.title()} {EXPORT_REGISTRY[export_type].label}',
+                    'date_from': date.fromisoformat(files[0]['date_from']),
+                    'date_to': date.fromisoformat(files[0]['date_to']),
+                    'generated_at': datetime.fromisoformat(max(entry['generated_at'] for entry in files)),
+                    'files': files,
+                })
+    return reports
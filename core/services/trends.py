@@ -0,0 +1,129 @@
+"""
+Consumption and production trends.
+
+Each trend is one grouped query: consumption reads the DailyMaterialUsage
+rollup and production reads DailyProduction, both bucketed by day, week or
+month with TruncWeek/TruncMonth and summed in the database, so a full year
+costs one query however many entries were logged. Results are cached per
+(series, granularity, range); saving or deleting an entry bumps a cache
+generation so the next request recomputes (see core/signals.py).
+"""
+from dataclasses import dataclass
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+
+from ..models import DailyMaterialUsage, DailyProduction, RawMaterial
+
+TRENDS_GENERATION_KEY = 'core:trends:generation'
+
+GRANULARITIES = {
+    'day': ('Daily', lambda field: F(field)),
+    'week': ('Weekly', TruncWeek),
+    'month': ('Monthly', TruncMonth),
+}
+
+
+@dataclass(frozen=True)
+class TrendSeries:
+    """What a trend is grouped by: the source rows, the date and quantity fields and the label fields"""
+    label: str
+    queryset: object  # Callable returning the base queryset
+    date_field: str
+    quantity_field: str
+    group_fields: tuple
+    display: object  # Maps a grouped row to its series label
+
+
+CATEGORY_LABELS = dict(RawMaterial.CATEGORY_CHOICES)
+
+TREND_SERIES = {
+    'material': TrendSeries(
+        label='Consumption by Material',
+        queryset=DailyMaterialUsage.objects.all,
+        date_field='date',
+        quantity_field='total_quantity',
+        group_fields=('raw_material__name', 'raw_material__unit'),
+        display=lambda row: f"{row['raw_material__name']} ({row['raw_material__unit']})",
+    ),
+    'category': TrendSeries(
+        label='Consumption by Category',
+        queryset=DailyMaterialUsage.objects.all,
+        date_field='date',
+        quantity_field='total_quantity',
+        # Units differ between materials, so categories are totalled per unit
+        group_fields=('raw_material__category', 'raw_material__unit'),
+        display=lambda row: (
+            f"{CATEGORY_LABELS.get(row['raw_material__category'], row['raw_material__category'])} "
+            f"({row['raw_material__unit']})"
+        ),
+    ),
+    'product': TrendSeries(
+        label='Production by Product',
+        queryset=DailyProduction.objects.all,
+        date_field='date',
+        quantity_field='quantity',
+        group_fields=('product_type__name',),
+        display=lambda row: row['product_type__name'],
+    ),
+}
+
+
+def compute_trend(series: str, granularity: str, date_from, date_to) -> dict:
+    """
+    Bucketed totals in one grouped query.
+
+    Returns the series labels, one (bucket, values) row per bucket with a
+    value per series (newest bucket first), and each series' total.
+    """
+    spec = TREND_SERIES[series]
+    bucket = GRANULARITIES[granularity][1](spec.date_field)
+    rows = (
+        spec.queryset()
+        .filter(**{f'{spec.date_field}__gte': date_from, f'{spec.date_field}__lte': date_to})
+        .annotate(bucket=bucket)
+        .values('bucket', *spec.group_fields)
+        .annotate(total=Sum(spec.quantity_field))
+        .order_by('-bucket')
+    )
+
+    labels = []
+    buckets = {}
+    for row in rows:
+        label = spec.display(row)
+        if label not in labels:
+            labels.append(label)
+        buckets.setdefault(row['bucket'], {})[label] = row['total']
+    labels.sort()
+
+    return {
+        'labels': labels,
+        'rows': [
+            (bucket, [totals.get(label) for label in labels])
+            for bucket, totals in buckets.items()
+        ],
+        'totals': [
+            sum(totals.get(label) or 0 for totals in buckets.values())
+            for label in labels
+        ],
+    }
+
+
+def get_trend(series: str, granularity: str, date_from, date_to) -> dict:
+    """Return the cached trend, computing it on a miss or after new entries."""
+    generation = cache.get_or_set(TRENDS_GENERATION_KEY, 0, None)
+    key = f'core:trends:{generation}:{series}:{granularity}:{date_from}:{date_to}'
+    trend = cache.get(key)
+    if trend is None:
+        trend = compute_trend(series, granularity, date_from, date_to)
+        cache.set(key, trend, settings.TRENDS_CACHE_SECONDS)
+    return trend
+
+
+def invalidate_trends(**kwargs):
+    """Start a new cache generation; usable directly as a signal receiver."""
+    try:
+        cache.incr(TRENDS_GENERATION_KEY)
+    except ValueError:
+        cache.set(TRENDS_GENERATION_KEY, 1, None)
@@ -0,0 +1,41 @@
+"""
+Signal wiring for cached, derived data in the core app.
+"""
+from django.db.models.signals import post_delete, post_save
+
+from .models import DailyConsumption, DailyProduction, ProductType, PurchaseOrder, PurchaseOrderItem, RawMaterial
+from .services.dashboard import invalidate_dashboard_snapshot
+from .services.forecast import invalidate_forecast
+from .services.trends import invalidate_trends
+
+
+def release_order_counters(sender, instance, **kwargs):
+    """Keep PurchaseOrder counters in step when an item is deleted, including by cascade"""
+    instance.release_counters()
+
+
+def connect_signals():
+    """Connect counter and cache invalidation receivers; called from CoreConfig.ready()"""
+    post_delete.connect(release_order_counters, sender=PurchaseOrderItem, dispatch_uid='order_counters_release')
+    for model in (DailyConsumption, DailyProduction, PurchaseOrder, PurchaseOrderItem):
+        for signal in (post_save, post_delete):
+            signal.connect(
+                invalidate_dashboard_snapshot,
+                sender=model,
+                dispatch_uid=f'dashboard_snapshot_{model.__name__}_{signal is post_save}',
+            )
+    # Trends show material and product names, so renames invalidate them too
+    for model in (DailyConsumption, DailyProduction, RawMaterial, ProductType):
+        for signal in (post_save, post_delete):
+            signal.connect(
+                invalidate_trends,
+                sender=model,
+                dispatch_uid=f'trends_{model.__name__}_{signal is post_save}',
+            )
+    for model in (DailyConsumption, RawMaterial):
+        for signal in (post_save, post_delete):
+            signal.connect(
+                invalidate_forecast,
+                sender=model,
+                dispatch_uid=f'forecast_{model.__name__}_{signal is post_save}',
+            )
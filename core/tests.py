@@ -1,3 +1,616 @@
-from django.test import TestCase
+import csv
+import gzip
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO, StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from openpyxl import load_workbook
+from pypdf import PdfReader
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from .models import (
+    Customer, DailyConsumption, DailyMaterialUsage, DailyProduction, ExportJob, ProductType, PurchaseOrder,
+    PurchaseOrderItem, RawMaterial
+)
+from .services import export_cache
+from .services.allocation import allocate_production, release_allocations
+from .services.export import (
+    PARQUET_AVAILABLE, PDF_CELL_PADDING, PDF_FONT_SIZE, _pdf_document, _pdf_fitter, _pdf_intro, _pdf_page_capacity,
+    _pdf_page_count, export_to_pdf_parallel, export_to_pdf_stream
+)
+from .services.export_jobs import claim_next_job, enqueue_export, export_path, fail_stale_jobs, run_export_job
+from .services.export_limits import heavy_export_slot
+from .services.export_sources import EXPORT_REGISTRY
+from .services.export_workbook import WORKBOOK_SHEETS
+from .services.pagination import paginate_keyset
+from .services.reports import generate_reports
+
+
+class OrderCounterTests(TestCase):
+    """Stored PurchaseOrder counters must always match the item rows."""
+
+    def setUp(self):
+        self.customer = Customer.objects.create(name='Test Customer')
+        self.pack = ProductType.objects.create(name='Food Pack')
+        self.platter = ProductType.objects.create(name='Platter')
+        self.order = PurchaseOrder.objects.create(customer=self.customer)
+
+    def assertCountersMatchItems(self, *orders):
+        for order in orders:
+            stored = PurchaseOrder.objects.filter(pk=order.pk).values(*PurchaseOrder.COUNTER_FIELDS).first()
+            if stored is None:
+                continue
+            PurchaseOrder.objects.filter(pk=order.pk).recompute_fulfillment_counters()
+            expected = PurchaseOrder.objects.filter(pk=order.pk).values(*PurchaseOrder.COUNTER_FIELDS).first()
+            self.assertEqual(stored, expected)
+
+    def test_counters_follow_item_save(self):
+        item = PurchaseOrderItem.objects.create(purchase_order=self.order, product_type=self.pack, quantity_ordered=5)
+        PurchaseOrderItem.objects.create(
+            purchase_order=self.order, product_type=self.platter, quantity_ordered=2, quantity_fulfilled=2
+        )
+        self.order.refresh_from_db()
+        self.assertEqual(
+            (self.order.total_ordered, self.order.total_fulfilled, self.order.item_count, self.order.fulfilled_item_count),
+            (7, 2, 2, 1),
+        )
+
+        item.quantity_fulfilled = 5
+        item.save()
+        self.order.refresh_from_db()
+        self.assertEqual((self.order.total_fulfilled, self.order.fulfilled_item_count), (7, 2))
+        self.assertCountersMatchItems(self.order)
+
+    def test_order_save_keeps_counters_changed_since_load(self):
+        stale = PurchaseOrder.objects.get(pk=self.order.pk)
+        PurchaseOrderItem.objects.create(purchase_order=self.order, product_type=self.pack, quantity_ordered=5)
+
+        stale.status = 'in_progress'
+        stale.save()
+        self.order.refresh_from_db()
+        self.assertEqual((self.order.status, self.order.total_ordered, self.order.item_count), ('in_progress', 5, 1))
+
+    def test_counters_follow_item_moved_to_another_order(self):
+        other = PurchaseOrder.objects.create(customer=self.customer)
+        item = PurchaseOrderItem.objects.create(purchase_order=self.order, product_type=self.pack, quantity_ordered=5)
+
+        item.purchase_order = other
+        item.save()
+        self.assertCountersMatchItems(self.order, other)
+        other.refresh_from_db()
+        self.assertEqual(other.item_count, 1)
+
+    def test_counters_follow_item_delete(self):
+        item = PurchaseOrderItem.objects.create(purchase_order=self.order, product_type=self.pack, quantity_ordered=5)
+        PurchaseOrderItem.objects.get(pk=item.pk).delete()
+        self.order.refresh_from_db()
+        self.assertEqual((self.order.total_ordered, self.order.item_count), (0, 0))
+
+    def test_counters_follow_cascade_delete(self):
+        PurchaseOrderItem.objects.create(purchase_order=self.order, product_type=self.pack, quantity_ordered=5)
+        PurchaseOrderItem.objects.create(
+            purchase_order=self.order, product_type=self.platter, quantity_ordered=3, quantity_fulfilled=1
+        )
+
+        self.pack.delete()
+        self.order.refresh_from_db()
+        self.assertEqual((self.order.total_ordered, self.order.total_fulfilled, self.order.item_count), (3, 1, 1))
+        self.assertCountersMatchItems(self.order)
+
+
+class KeysetPaginationTests(TestCase):
+    """Cursor pages must cover every row once, in order, across ties in the leading key."""
+
+    def setUp(self):
+        rice = RawMaterial.objects.create(name='Rice', category='miscellaneous', unit='kg')
+        # Several entries per day so page boundaries fall inside a date
+        for offset in range(12):
+            DailyConsumption.objects.create(
+                date=date(2026, 1, 15) - timedelta(days=offset // 4), raw_material=rice, quantity=Decimal('1.00')
+            )
+        self.factory = RequestFactory()
+        self.expected = list(
+            DailyConsumption.objects.order_by('-date', '-created_at', '-id').values_list('pk', flat=True)
+        )
+
+    def page(self, cursor=None):
+        request = self.factory.get('/', {'cursor': cursor} if cursor else {})
+        return paginate_keyset(DailyConsumption.objects.all(), request, per_page=5)
+
+    def test_next_cursors_walk_every_row_once(self):
+        seen = []
+        page = self.page()
+        self.assertFalse(page.has_previous)
+        while True:
+            seen.extend(row.pk for row in page)
+            if not page.has_next:
+                break
+            page = self.page(page.next_cursor)
+        self.assertEqual(seen, self.expected)
+
+    def test_previous_cursor_returns_the_page_before(self):
+        second = self.page(self.page().next_cursor)
+        self.assertEqual([row.pk for row in second], self.expected[5:10])
+
+        first = self.page(second.prev_cursor)
+        self.assertEqual([row.pk for row in first], self.expected[:5])
+        self.assertFalse(first.has_previous)
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        self.assertEqual([row.pk for row in self.page('not-a-cursor')], self.expected[:5])
+
+
+class ExportTestCase(TestCase):
+    """Exports run for a logged-in user and write under a temporary EXPORT_ROOT."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('exporter', password='exporter')
+        cls.rice = RawMaterial.objects.create(name='Rice', category='miscellaneous', unit='kg')
+        cls.oil = RawMaterial.objects.create(name='Cooking Oil', category='oil', unit='liters')
+        cls.pack = ProductType.objects.create(name='Food Pack')
+        cls.customer = Customer.objects.create(name='Test Customer')
+        cls.day = date(2026, 1, 15)
+        for offset in range(3):
+            DailyConsumption.objects.create(
+                date=cls.day - timedelta(days=offset), raw_material=cls.rice, quantity=Decimal('2.50')
+            )
+        DailyConsumption.objects.create(date=cls.day, raw_material=cls.oil, quantity=Decimal('1.00'))
+        DailyProduction.objects.create(date=cls.day, product_type=cls.pack, quantity=4)
+        cls.order = PurchaseOrder.objects.create(customer=cls.customer)
+        PurchaseOrderItem.objects.create(purchase_order=cls.order, product_type=cls.pack, quantity_ordered=10)
+
+    def setUp(self):
+        root = Path(self.enterContext(TemporaryDirectory()))
+        self.enterContext(override_settings(
+            EXPORT_ROOT=root, EXPORT_CACHE_ROOT=root / 'cache', REPORTS_ROOT=root / 'reports'
+        ))
+        self.client.force_login(self.user)
+
+    def download(self, url, status=200):
+        """GET an export and return its body"""
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status)
+        try:
+            return b''.join(response.streaming_content) if response.streaming else response.content
+        finally:
+            response.close()
+
+
+class ExcelExportTests(ExportTestCase):
+    """Excel downloads stream every row below the header."""
+
+    def test_consumption_excel_lists_every_row(self):
+        sheet = load_workbook(BytesIO(self.download(reverse('export_consumption_excel')))).active
+        rows = list(sheet.iter_rows(values_only=True))
+
+        header = rows.index(tuple(EXPORT_REGISTRY['consumption'].headers))
+        data = rows[header + 1:header + 5]
+        self.assertEqual([row[0].date() for row in data], sorted((row[0].date() for row in data), reverse=True))
+        self.assertEqual(sorted(row[1] for row in data), ['Cooking Oil', 'Rice', 'Rice', 'Rice'])
+        self.assertIn(('Summary',) + (None,) * 4, rows)
+
+
+class CsvExportTests(ExportTestCase):
+    """CSV downloads stream every row, as TSV or gzip on request."""
+
+    def rows(self, body, delimiter=','):
+        return list(csv.reader(StringIO(body.decode('utf-8-sig')), delimiter=delimiter))
+
+    def test_csv_has_header_and_every_row(self):
+        rows = self.rows(self.download(reverse('export_consumption_csv')))
+        self.assertEqual(rows[0], EXPORT_REGISTRY['consumption'].headers)
+        self.assertEqual(len(rows), 5)
+
+    def test_tsv_and_gzip(self):
+        url = reverse('export_consumption_csv')
+        tsv = self.rows(self.download(f'{url}?format=tsv'), delimiter='\t')
+        self.assertEqual(tsv, self.rows(self.download(url)))
+
+        compressed = self.download(f'{url}?format=tsv&gzip=1')
+        self.assertEqual(self.rows(gzip.decompress(compressed), delimiter='\t'), tsv)
+
+    def test_every_module_has_a_csv_endpoint(self):
+        for export_type, spec in EXPORT_REGISTRY.items():
+            with self.subTest(export_type=export_type):
+                rows = self.rows(self.download(reverse('export_module', args=[export_type, 'csv'])))
+                self.assertEqual(rows[0], spec.headers)
+
+
+class ExportJobTests(ExportTestCase):
+    """Queued exports are written by the worker and fail cleanly."""
+
+    def test_queued_export_is_written_and_downloadable(self):
+        response = self.client.post(reverse('export_job_create', args=['consumption', 'excel']))
+        job = ExportJob.objects.get()
+        self.assertRedirects(response, reverse('export_job_detail', args=[job.pk]))
+
+        job = run_export_job(claim_next_job())
+        self.assertEqual((job.status, job.rows_total, job.rows_processed), ('done', 4, 4))
+        self.assertTrue(export_path(job).exists())
+        self.assertTrue(self.download(reverse('export_job_download', args=[job.pk])).startswith(b'PK'))
+
+    def test_invalid_stored_filter_fails_the_job(self):
+        ExportJob.objects.create(
+            export_type='consumption', export_format='csv', filters={'date_from': 'not-a-date'}, created_by=self.user
+        )
+        job = run_export_job(claim_next_job())
+        self.assertEqual(job.status, 'failed')
+        self.assertTrue(job.error)
+        self.assertEqual(list(Path(settings.EXPORT_ROOT).glob('*.part')), [])
+
+    def test_stale_running_job_is_failed(self):
+        job = enqueue_export('consumption', 'csv', user=self.user)
+        ExportJob.objects.filter(pk=job.pk).update(status='running', started_at=timezone.now() - timedelta(days=1))
+
+        self.assertEqual(fail_stale_jobs(), 1)
+        self.assertEqual(ExportJob.objects.get(pk=job.pk).status, 'failed')
+
+
+class ExportCacheTests(ExportTestCase):
+    """Cached export files are reused until the data they were built from changes."""
+
+    def test_repeat_download_is_served_from_cache(self):
+        url = reverse('export_consumption_pdf')
+        first = self.download(url)
+
+        self.assertIsNotNone(export_cache.lookup(export_cache.cache_key('consumption', 'pdf'), 'pdf'))
+        # The export timestamp would differ if the file were rendered again
+        self.assertEqual(self.download(url), first)
+
+    def test_key_changes_with_new_rows_and_filters(self):
+        key = export_cache.cache_key('consumption', 'csv')
+        self.assertEqual(export_cache.cache_key('consumption', 'csv'), key)
+        self.assertNotEqual(export_cache.cache_key('consumption', 'csv', {'category': 'oil'}), key)
+
+        DailyConsumption.objects.create(date=self.day, raw_material=self.oil, quantity=Decimal('1.00'))
+        self.assertNotEqual(export_cache.cache_key('consumption', 'csv'), key)
+
+    def test_orders_key_changes_with_status(self):
+        PurchaseOrder.objects.filter(pk=self.order.pk).update(status='completed')
+        key = export_cache.cache_key('orders', 'excel')
+
+        order = PurchaseOrder.objects.get(pk=self.order.pk)
+        order.update_status_based_on_fulfillment()
+        self.assertEqual(order.status, 'pending')
+        self.assertNotEqual(export_cache.cache_key('orders', 'excel'), key)
+
+
+class ExportRegistryTests(ExportTestCase):
+    """Every registered module exports through the one generic view."""
+
+    def test_every_module_exports_excel_and_pdf(self):
+        for export_type in EXPORT_REGISTRY:
+            with self.subTest(export_type=export_type):
+                self.assertTrue(self.download(reverse('export_module', args=[export_type, 'excel'])).startswith(b'PK'))
+                self.assertTrue(self.download(reverse('export_module', args=[export_type, 'pdf'])).startswith(b'%PDF'))
+
+    def test_unknown_module_or_format_is_not_found(self):
+        self.download(reverse('export_module', args=['suppliers', 'excel']), status=404)
+        self.download(reverse('export_module', args=['customers', 'parquet']), status=404)
+
+
+class ExportFilterTests(ExportTestCase):
+    """Exports apply the list-page filters and reject values they cannot parse."""
+
+    def csv_rows(self, export_type, query):
+        body = self.download(f"{reverse('export_module', args=[export_type, 'csv'])}?{query}")
+        return list(csv.reader(StringIO(body.decode('utf-8-sig'))))[1:]
+
+    def test_filters_select_rows_in_sql(self):
+        self.assertEqual(len(self.csv_rows('consumption', f'date_from={self.day}')), 2)
+        self.assertEqual([row[1] for row in self.csv_rows('consumption', 'category=oil')], ['Cooking Oil'])
+        self.assertEqual(len(self.csv_rows('production', f'product={self.pack.pk}')), 1)
+
+    def test_invalid_values_are_rejected(self):
+        url = reverse('export_module', args=['consumption', 'excel'])
+        self.download(f'{url}?date_from=2026-13-40', status=400)
+        self.download(f"{reverse('export_module', args=['production', 'csv'])}?product=not-a-uuid", status=400)
+
+        response = self.client.post(f"{reverse('export_job_create', args=['consumption', 'csv'])}?date_to=yesterday")
+        self.assertRedirects(response, reverse('export_job_list'))
+        self.assertFalse(ExportJob.objects.exists())
+
+    def test_search_with_markup_renders(self):
+        Customer.objects.create(name='<b>Bold & Co')
+        self.assertTrue(self.download(f"{reverse('export_customers_pdf')}?search=%3Cb%3E").startswith(b'%PDF'))
+        self.assertEqual([row[0] for row in self.csv_rows('customers', 'search=%3Cb%3E')], ['<b>Bold & Co'])
+
+
+class PdfExportTests(SimpleTestCase):
+    """PDF reports lay rows out one fixed-height page at a time."""
+
+    headers = ['Number', 'Item']
+
+    def test_rows_fill_the_predicted_pages(self):
+        rows = [(number, f'Item {number}') for number in range(300)]
+        reader = PdfReader(export_to_pdf_stream(iter(rows), self.headers, title='Items'))
+
+        capacity = _pdf_page_capacity(_pdf_document(BytesIO()), _pdf_intro('Items'))
+        self.assertGreater(len(reader.pages), 1)
+        self.assertEqual(len(reader.pages), _pdf_page_count(len(rows), *capacity))
+        text = [page.extract_text() for page in reader.pages]
+        self.assertTrue(all('Number' in page for page in text))
+        self.assertIn('Item 299', text[-1])
+
+    def test_fitter_cuts_long_values_to_one_line(self):
+        width = 60
+        fit = _pdf_fitter(width)
+        self.assertEqual(fit('short'), 'short')
+        for text in ('@' * 40, 'W' * 40, 'Salted & Pepper ' * 5):
+            with self.subTest(text=text):
+                self.assertTrue(fit(text).endswith('…'))
+                self.assertLessEqual(stringWidth(fit(text), 'Helvetica', PDF_FONT_SIZE), width - 2 * PDF_CELL_PADDING)
+
+
+class ParallelPdfExportTests(SimpleTestCase):
+    """Parallel PDF parts join into one report with continuous page numbers."""
+
+    def test_parts_are_numbered_in_order(self):
+        rows = [(number, f'Item {number}') for number in range(300)]
+        stream = PdfReader(export_to_pdf_stream(iter(rows), PdfExportTests.headers, title='Items'))
+        parallel = PdfReader(export_to_pdf_parallel(
+            iter(rows), PdfExportTests.headers, title='Items', summary={'Total Items': 300}, workers=2, chunk_pages=1
+        ))
+
+        # Same table pages as the single-process layout, then the summary page
+        self.assertEqual(len(parallel.pages), len(stream.pages) + 1)
+        for number, page in enumerate(parallel.pages, 1):
+            self.assertRegex(page.extract_text(), rf'Page {number}\b')
+        self.assertIn('Item 299', parallel.pages[-2].extract_text())
+        self.assertIn('Total Items', parallel.pages[-1].extract_text())
+
+
+class WorkbookExportTests(ExportTestCase):
+    """The full workbook holds one sheet per module."""
+
+    def test_one_sheet_per_module(self):
+        workbook = load_workbook(BytesIO(self.download(reverse('export_full_workbook'))))
+        self.assertEqual(workbook.sheetnames, [EXPORT_REGISTRY[name].sheet_name for name in WORKBOOK_SHEETS])
+
+        rows = list(workbook['Order Items'].iter_rows(values_only=True))
+        header = rows.index(tuple(EXPORT_REGISTRY['order_items'].headers))
+        self.assertEqual(rows[header + 1][3:6], ('Food Pack', 10, 0))
+
+    def test_order_item_filters_are_validated(self):
+        url = reverse('export_module', args=['order_items', 'csv'])
+        self.download(f'{url}?customer={self.customer.pk}&date_from={self.day}')
+        self.download(f'{url}?customer=not-a-uuid', status=400)
+        self.download(f'{url}?date_to=2026-02-30', status=400)
+
+
+class ParquetExportTests(ExportTestCase):
+    """Parquet exports carry typed fact columns and are only offered with pyarrow."""
+
+    @skipUnless(PARQUET_AVAILABLE, 'pyarrow is not installed')
+    def test_consumption_facts_are_typed(self):
+        import pyarrow
+        import pyarrow.parquet
+
+        body = self.download(reverse('export_module', args=['consumption', 'parquet']))
+        table = pyarrow.parquet.read_table(BytesIO(body))
+        self.assertEqual(table.num_rows, 4)
+        self.assertEqual(table.schema.field('date').type, pyarrow.date32())
+        self.assertEqual(table.schema.field('quantity').type, pyarrow.decimal128(10, 2))
+        dates = table.column('date').to_pylist()
+        self.assertEqual(dates, sorted(dates))
+
+    def test_parquet_is_hidden_without_pyarrow(self):
+        parquet_url = reverse('export_module', args=['consumption', 'parquet'])
+        with mock.patch('core.views.PARQUET_AVAILABLE', False), \
+                mock.patch('core.services.export_jobs.PARQUET_AVAILABLE', False):
+            self.assertNotContains(self.client.get(reverse('consumption_history')), parquet_url)
+            self.assertNotContains(self.client.get(reverse('export_job_list')), 'Parquet')
+            with self.assertRaises(ValueError):
+                enqueue_export('consumption', 'parquet', user=self.user)
+
+
+class ReportTests(ExportTestCase):
+    """Nightly reports are only rendered again when rows inside their date window change."""
+
+    def generate(self):
+        return dict(generate_reports(today=self.day + timedelta(days=1)))
+
+    def rendered(self, results):
+        return sorted(name for name, rendered in results.items() if rendered)
+
+    def test_unchanged_reports_are_skipped(self):
+        first = self.generate()
+        self.assertEqual(len(first), 12)
+        self.assertTrue(all(first.values()))
+
+        DailyConsumption.objects.create(date=self.day - timedelta(days=60), raw_material=self.rice, quantity=Decimal('1'))
+        self.assertEqual(self.rendered(self.generate()), [])
+
+        DailyConsumption.objects.create(date=self.day, raw_material=self.rice, quantity=Decimal('1'))
+        self.assertEqual(self.rendered(self.generate()), [
+            'consumption-daily.pdf', 'consumption-daily.xlsx', 'consumption-monthly.pdf',
+            'consumption-monthly.xlsx', 'consumption-weekly.pdf', 'consumption-weekly.xlsx',
+        ])
+
+    def test_reports_page_serves_the_files(self):
+        self.generate()
+        self.assertContains(self.client.get(reverse('report_list')), 'Daily Consumption History')
+        body = self.download(reverse('report_download', args=['consumption-daily.pdf']))
+        self.assertTrue(body.startswith(b'%PDF'))
+        self.download(reverse('report_download', args=['missing.pdf']), status=404)
+
+
+class ExportLimitTests(ExportTestCase):
+    """Heavy direct exports share a fixed number of slots; oversized ones are queued."""
+
+    @override_settings(EXPORT_MAX_CONCURRENT=1)
+    def test_busy_slots_answer_429(self):
+        with heavy_export_slot():
+            response = self.client.get(reverse('export_consumption_excel'))
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response['Retry-After'], '30')
+            # CSV streams are not limited
+            self.download(reverse('export_consumption_csv'))
+
+        self.download(reverse('export_consumption_excel'))
+
+    @override_settings(EXPORT_DIRECT_MAX_ROWS=2)
+    def test_oversized_export_is_queued_once(self):
+        url = f"{reverse('export_consumption_excel')}?category=miscellaneous"
+        first = self.client.get(url)
+        job = ExportJob.objects.get()
+        self.assertRedirects(first, reverse('export_job_detail', args=[job.pk]))
+        self.assertEqual(job.filters, {'category': 'miscellaneous'})
+
+        self.assertRedirects(self.client.get(url), reverse('export_job_detail', args=[job.pk]))
+        self.assertEqual(ExportJob.objects.count(), 1)
+
+
+class ExportSummaryTests(ExportTestCase):
+    """Export summaries come from one aggregate over the filtered rows."""
+
+    def test_consumption_summary_totals_per_unit(self):
+        with self.assertNumQueries(1):
+            summary = EXPORT_REGISTRY['consumption'].summary()
+        self.assertEqual(summary, {
+            'Total Records': 4,
+            'Date Range': '2026-01-13 to 2026-01-15',
+            'Total Quantity': '7.50 kg, 1.00 liters',
+            'Category: Miscellaneous': '7.50 kg',
+            'Category: Oil': '1.00 liters',
+            'Material: Cooking Oil': '1.00 liters',
+            'Material: Rice': '7.50 kg',
+        })
+
+    def test_summary_follows_filters(self):
+        summary = EXPORT_REGISTRY['consumption'].summary({'category': 'oil', 'date_from': '2026-01-15'})
+        self.assertEqual(summary['Total Records'], 1)
+        self.assertEqual(summary['Total Quantity'], '1.00 liters')
+        self.assertEqual((summary['Category'], summary['From']), ('Oil', '2026-01-15'))
+
+    def test_markup_in_names_renders(self):
+        salt = RawMaterial.objects.create(name='Salt <b> & Pepper', category='miscellaneous', unit='kg')
+        DailyConsumption.objects.create(date=self.day, raw_material=salt, quantity=Decimal('1.00'))
+        self.assertTrue(self.download(reverse('export_consumption_pdf')).startswith(b'%PDF'))
+
+
+class ConsumptionRollupTests(TestCase):
+    """DailyMaterialUsage must always equal the summed consumption entries."""
+
+    def setUp(self):
+        self.rice = RawMaterial.objects.create(name='Rice', category='miscellaneous', unit='kg')
+        self.oil = RawMaterial.objects.create(name='Cooking Oil', category='oil', unit='liters')
+        self.day = date(2026, 1, 15)
+
+    def assertRollupMatchesEntries(self):
+        stored = {
+            (day, material_id): (quantity, entries)
+            for day, material_id, quantity, entries in DailyMaterialUsage.objects.values_list(
+                'date', 'raw_material_id', 'total_quantity', 'entry_count'
+            )
+        }
+        self.assertEqual(stored, DailyConsumption.objects.usage_totals())
+
+    def test_rollup_follows_save_and_delete(self):
+        first = DailyConsumption.objects.create(date=self.day, raw_material=self.rice, quantity=Decimal('2.50'))
+        DailyConsumption.objects.create(date=self.day, raw_material=self.rice, quantity=Decimal('1.25'))
+        usage = DailyMaterialUsage.objects.get(date=self.day, raw_material=self.rice)
+        self.assertEqual((usage.total_quantity, usage.entry_count), (Decimal('3.75'), 2))
+
+        first.quantity = Decimal('4.00')
+        first.save()
+        self.assertRollupMatchesEntries()
+
+        first.date = self.day + timedelta(days=1)
+        first.raw_material = self.oil
+        first.save()
+        self.assertRollupMatchesEntries()
+
+        first.delete()
+        self.assertRollupMatchesEntries()
+        self.assertFalse(DailyMaterialUsage.objects.filter(raw_material=self.oil).exists())
+
+    def test_rollup_follows_queryset_writes(self):
+        DailyConsumption.objects.bulk_create([
+            DailyConsumption(date=self.day + timedelta(days=offset), raw_material=material, quantity=Decimal('1.00'))
+            for offset in range(3)
+            for material in (self.rice, self.oil)
+        ])
+        self.assertRollupMatchesEntries()
+
+        DailyConsumption.objects.filter(raw_material=self.rice).update(quantity=Decimal('2.00'))
+        self.assertRollupMatchesEntries()
+
+        DailyConsumption.objects.filter(date=self.day).update(date=self.day - timedelta(days=1))
+        self.assertRollupMatchesEntries()
+
+        DailyConsumption.objects.filter(raw_material=self.oil).delete()
+        self.assertRollupMatchesEntries()
+
+    def test_rollup_follows_cascade_delete(self):
+        DailyConsumption.objects.create(date=self.day, raw_material=self.rice, quantity=Decimal('1.00'))
+        DailyConsumption.objects.create(date=self.day, raw_material=self.oil, quantity=Decimal('1.00'))
+
+        self.rice.delete()
+        self.assertRollupMatchesEntries()
+
+
+class AllocationTests(TestCase):
+    """Production fills the oldest open orders first, and releasing allocations undoes it."""
+
+    def setUp(self):
+        self.customer = Customer.objects.create(name='Test Customer')
+        self.pack = ProductType.objects.create(name='Food Pack')
+        self.items = []
+        for minute in range(3):
+            order = PurchaseOrder.objects.create(customer=self.customer)
+            # Distinct creation times, so FIFO order does not fall back to the random UUID
+            PurchaseOrder.objects.filter(pk=order.pk).update(
+                created_at=datetime(2026, 1, 15, 8, minute, tzinfo=dt_timezone.utc)
+            )
+            self.items.append(
+                PurchaseOrderItem.objects.create(purchase_order=order, product_type=self.pack, quantity_ordered=10)
+            )
+        self.day = date(2026, 1, 15)
+
+    def fulfilled(self):
+        return [PurchaseOrderItem.objects.get(pk=item.pk).quantity_fulfilled for item in self.items]
+
+    def statuses(self):
+        return [PurchaseOrder.objects.get(pk=item.purchase_order_id).status for item in self.items]
+
+    def test_oldest_order_is_filled_first(self):
+        DailyProduction.objects.create(date=self.day, product_type=self.pack, quantity=15)
+
+        result = allocate_production(date=self.day)
+        self.assertEqual(result, {'units': 15, 'items': 2, 'orders': 2})
+        self.assertEqual(self.fulfilled(), [10, 5, 0])
+        self.assertEqual(self.statuses(), ['completed', 'in_progress', 'pending'])
+        self.assertEqual(DailyProduction.objects.get().quantity_allocated, 15)
+
+    def test_rerun_allocates_nothing_twice(self):
+        DailyProduction.objects.create(date=self.day, product_type=self.pack, quantity=15)
+        allocate_production()
+
+        self.assertEqual(allocate_production()['units'], 0)
+        DailyProduction.objects.create(date=self.day, product_type=self.pack, quantity=10)
+        allocate_production()
+        self.assertEqual(self.fulfilled(), [10, 10, 5])
+
+    def test_cancelled_order_is_skipped_and_releases_its_units(self):
+        DailyProduction.objects.create(date=self.day, product_type=self.pack, quantity=15)
+        allocate_production()
+
+        first_order = self.items[0].purchase_order
+        first_order.status = 'cancelled'
+        first_order.save()
+        released = release_allocations(self.items[0].allocations.all())
+        allocate_production(product_type_ids=released)
+
+        self.assertEqual(self.fulfilled(), [0, 10, 5])
+        self.assertEqual(self.statuses(), ['cancelled', 'completed', 'in_progress'])
+        self.assertEqual(DailyProduction.objects.get().quantity_allocated, 15)
@@ -8,6 +8,7 @@ urlpatterns = [
     # Raw Materials
     path('raw-materials/', views.raw_material_list, name='raw_material_list'),
     path('raw-materials/add/', views.raw_material_create, name='raw_material_create'),
+    path('raw-materials/forecast/', views.material_forecast, name='material_forecast'),
     path('raw-materials/<uuid:pk>/edit/', views.raw_material_edit, name='raw_material_edit'),
     path('raw-materials/<uuid:pk>/delete/', views.raw_material_delete, name='raw_material_delete'),
 
@@ -37,32 +38,56 @@ urlpatterns = [
     # Purchase Orders
     path('orders/', views.purchase_order_list, name='purchase_order_list'),
     path('orders/create/', views.purchase_order_create, name='purchase_order_create'),
+    path('orders/requirements/', views.material_requirements, name='material_requirements'),
     path('orders/<uuid:pk>/', views.purchase_order_detail, name='purchase_order_detail'),
     path('orders/<uuid:pk>/update/', views.purchase_order_add_update, name='purchase_order_add_update'),
     path('orders/<uuid:pk>/status/', views.purchase_order_change_status, name='purchase_order_change_status'),
     path('orders/<uuid:pk>/delete/', views.purchase_order_delete, name='purchase_order_delete'),
 
+    # Export - any registered module
+    path('export/workbook/', views.export_full_workbook, name='export_full_workbook'),
+    path('export/<str:export_type>/<str:export_format>/', views.export_module, name='export_module'),
+
     # Export - Raw Materials
-    path('raw-materials/export/excel/', views.export_raw_materials_excel, name='export_raw_materials_excel'),
-    path('raw-materials/export/pdf/', views.export_raw_materials_pdf, name='export_raw_materials_pdf'),
+    path('raw-materials/export/excel/', views.export_module, {'export_type': 'raw_materials', 'export_format': 'excel'}, name='export_raw_materials_excel'),
+    path('raw-materials/export/pdf/', views.export_module, {'export_type': 'raw_materials', 'export_format': 'pdf'}, name='export_raw_materials_pdf'),
+    path('raw-materials/export/csv/', views.export_module, {'export_type': 'raw_materials', 'export_format': 'csv'}, name='export_raw_materials_csv'),
 
     # Export - Consumption
-    path('consumption/export/excel/', views.export_consumption_excel, name='export_consumption_excel'),
-    path('consumption/export/pdf/', views.export_consumption_pdf, name='export_consumption_pdf'),
+    path('consumption/export/excel/', views.export_module, {'export_type': 'consumption', 'export_format': 'excel'}, name='export_consumption_excel'),
+    path('consumption/export/pdf/', views.export_module, {'export_type': 'consumption', 'export_format': 'pdf'}, name='export_consumption_pdf'),
+    path('consumption/export/csv/', views.export_module, {'export_type': 'consumption', 'export_format': 'csv'}, name='export_consumption_csv'),
 
     # Export - Products
-    path('product-types/export/excel/', views.export_products_excel, name='export_products_excel'),
-    path('product-types/export/pdf/', views.export_products_pdf, name='export_products_pdf'),
+    path('product-types/export/excel/', views.export_module, {'export_type': 'products', 'export_format': 'excel'}, name='export_products_excel'),
+    path('product-types/export/pdf/', views.export_module, {'export_type': 'products', 'export_format': 'pdf'}, name='export_products_pdf'),
+    path('product-types/export/csv/', views.export_module, {'export_type': 'products', 'export_format': 'csv'}, name='export_products_csv'),
 
     # Export - Production
-    path('production/export/excel/', views.export_production_excel, name='export_production_excel'),
-    path('production/export/pdf/', views.export_production_pdf, name='export_production_pdf'),
+    path('production/export/excel/', views.export_module, {'export_type': 'production', 'export_format': 'excel'}, name='export_production_excel'),
+    path('production/export/pdf/', views.export_module, {'export_type': 'production', 'export_format': 'pdf'}, name='export_production_pdf'),
+    path('production/export/csv/', views.export_module, {'export_type': 'production', 'export_format': 'csv'}, name='export_production_csv'),
 
     # Export - Customers
-    path('customers/export/excel/', views.export_customers_excel, name='export_customers_excel'),
-    path('customers/export/pdf/', views.export_customers_pdf, name='export_customers_pdf'),
+    path('customers/export/excel/', views.export_module, {'export_type': 'customers', 'export_format': 'excel'}, name='export_customers_excel'),
+    path('customers/export/pdf/', views.export_module, {'export_type': 'customers', 'export_format': 'pdf'}, name='export_customers_pdf'),
+    path('customers/export/csv/', views.export_module, {'export_type': 'customers', 'export_format': 'csv'}, name='export_customers_csv'),
 
     # Export - Orders
-    path('orders/export/excel/', views.export_orders_excel, name='export_orders_excel'),
-    path('orders/export/pdf/', views.export_orders_pdf, name='export_orders_pdf'),
+    path('orders/export/excel/', views.export_module, {'export_type': 'orders', 'export_format': 'excel'}, name='export_orders_excel'),
+    path('orders/export/pdf/', views.export_module, {'export_type': 'orders', 'export_format': 'pdf'}, name='export_orders_pdf'),
+    path('orders/export/csv/', views.export_module, {'export_type': 'orders', 'export_format': 'csv'}, name='export_orders_csv'),
+
+    # Background Exports
+    path('exports/', views.export_job_list, name='export_job_list'),
+    path('exports/<str:export_type>/<str:export_format>/queue/', views.export_job_create, name='export_job_create'),
+    path('exports/<uuid:pk>/', views.export_job_detail, name='export_job_detail'),
+    path('exports/<uuid:pk>/download/', views.export_job_download, name='export_job_download'),
+
+    # Trends
+    path('trends/', views.trends, name='trends'),
+
+    # Pre-generated Reports
+    path('reports/', views.report_list, name='report_list'),
+    path('reports/<str:file_name>/', views.report_download, name='report_download'),
 ]
@@ -1,18 +1,37 @@
+from datetime import timedelta
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.db import transaction
 from django.db.models import Sum, Count
-from django.http import HttpResponse
-from datetime import timedelta
-from .services.export import export_to_excel, export_to_pdf, get_export_filename
+from django.http import FileResponse, Http404, HttpResponseBadRequest, StreamingHttpResponse
+from django.utils.http import urlencode
+from .services.export import (
+    export_to_csv_stream, get_export_filename, write_export,
+    CONTENT_TYPES, EXCEL_CONTENT_TYPE, FILE_EXTENSIONS, PARQUET_AVAILABLE
+)
+from .services import export_cache
+from .services.export_sources import EXPORT_LABELS, EXPORT_REGISTRY
+from .services.export_jobs import enqueue_export, export_path
+from .services.export_limits import ExportBusy, direct_row_limit, estimate_rows, heavy_export_slot
+from .services.export_workbook import WORKBOOK_EXPORT, WORKBOOK_TABLES, write_full_workbook
+from .services.reports import list_reports, load_manifest, reports_root
+from .services.pagination import paginate_keyset
+from .services.dashboard import get_dashboard_snapshot
+from .services.trends import GRANULARITIES, TREND_SERIES, get_trend
+from .services.forecast import HISTORY_DAYS, get_forecast
+from .services.mrp import compute_requirements
+from .services.allocation import allocate_production, release_allocations
 
 from .models import (
     RawMaterial, DailyConsumption, ProductType, DailyProduction,
-    Customer, PurchaseOrder, PurchaseOrderItem, PurchaseOrderUpdate
+    Customer, PurchaseOrder, PurchaseOrderItem, PurchaseOrderUpdate, ProductionAllocation, ExportJob
 )
 from .forms import (
-    RawMaterialForm, DailyConsumptionForm, ProductTypeForm, DailyProductionForm,
+    RawMaterialForm, DailyConsumptionForm, ProductTypeForm, RecipeComponentFormSet, DailyProductionForm,
     CustomerForm, PurchaseOrderForm, PurchaseOrderItemFormSet, PurchaseOrderUpdateForm
 )
 
@@ -20,24 +39,9 @@ from .forms import (
 @login_required
 def dashboard(request):
     """Main dashboard view with today's summary"""
-    today = timezone.now().date()
-
-    # Get today's consumption and production counts
-    today_consumption_count = DailyConsumption.objects.filter(date=today).count()
-    today_production_count = DailyProduction.objects.filter(date=today).count()
-
-    # Get recent activity (last 7 days)
-    last_7_days = today - timedelta(days=7)
-    recent_consumptions = DailyConsumption.objects.filter(date__gte=last_7_days).count()
-    recent_productions = DailyProduction.objects.filter(date__gte=last_7_days).count()
-
     context = {
         'user': request.user,
-        'today': today,
-        'today_consumption_count': today_consumption_count,
-        'today_production_count': today_production_count,
-        'recent_consumptions': recent_consumptions,
-        'recent_productions': recent_productions,
+        **get_dashboard_snapshot(),
     }
     return render(request, 'core/dashboard.html', context)
 
@@ -57,6 +61,7 @@ def raw_material_list(request):
         'materials': materials,
         'category_choices': RawMaterial.CATEGORY_CHOICES,
         'selected_category': category_filter,
+        'export_query': urlencode(EXPORT_REGISTRY['raw_materials'].filters_from(request.GET)),
     }
     return render(request, 'core/raw_materials/list.html', context)
 
@@ -138,12 +143,17 @@ def consumption_history(request):
     if category_filter:
         consumptions = consumptions.filter(raw_material__category=category_filter)
 
+    page = paginate_keyset(consumptions, request)
+
     context = {
-        'consumptions': consumptions,
+        'consumptions': page,
+        'page': page,
         'date_from': date_from,
         'date_to': date_to,
         'category_choices': RawMaterial.CATEGORY_CHOICES,
         'selected_category': category_filter,
+        'export_query': urlencode(EXPORT_REGISTRY['consumption'].filters_from(request.GET)),
+        'parquet_available': PARQUET_AVAILABLE,
     }
     return render(request, 'core/consumption/list.html', context)
 
@@ -211,15 +221,20 @@ def product_type_create(request):
     """Create a new product type"""
     if request.method == 'POST':
         form = ProductTypeForm(request.POST)
-        if form.is_valid():
-            form.save()
+        formset = RecipeComponentFormSet(request.POST, prefix='recipe')
+        if form.is_valid() and formset.is_valid():
+            product = form.save()
+            formset.instance = product
+            formset.save()
             messages.success(request, 'Product type added successfully.')
             return redirect('product_type_list')
     else:
         form = ProductTypeForm()
+        formset = RecipeComponentFormSet(prefix='recipe')
 
     return render(request, 'core/product_types/form.html', {
         'form': form,
+        'formset': formset,
         'title': 'Add Product Type',
         'button_text': 'Add Product'
     })
@@ -232,15 +247,19 @@ def product_type_edit(request, pk):
 
     if request.method == 'POST':
         form = ProductTypeForm(request.POST, instance=product)
-        if form.is_valid():
+        formset = RecipeComponentFormSet(request.POST, instance=product, prefix='recipe')
+        if form.is_valid() and formset.is_valid():
             form.save()
+            formset.save()
             messages.success(request, 'Product type updated successfully.')
             return redirect('product_type_list')
     else:
         form = ProductTypeForm(instance=product)
+        formset = RecipeComponentFormSet(instance=product, prefix='recipe')
 
     return render(request, 'core/product_types/form.html', {
         'form': form,
+        'formset': formset,
         'title': 'Edit Product Type',
         'button_text': 'Save Changes',
         'object': product
@@ -286,12 +305,12 @@ def production_history(request):
     if product_filter:
         productions = productions.filter(product_type__id=product_filter)
 
-    # Order by date descending
-    productions = productions.order_by('-date', '-created_at')
+    # Newest first, one page at a time
+    page = paginate_keyset(productions, request)
 
     # Group productions by date
     productions_by_day = []
-    for date, group in groupby(productions, key=attrgetter('date')):
+    for date, group in groupby(page, key=attrgetter('date')):
         productions_by_day.append({
             'date': date,
             'productions': list(group)
@@ -301,10 +320,13 @@ def production_history(request):
 
     context = {
         'productions_by_day': productions_by_day,
+        'page': page,
         'date_from': date_from,
         'date_to': date_to,
         'product_types': product_types,
         'selected_product': product_filter,
+        'export_query': urlencode(EXPORT_REGISTRY['production'].filters_from(request.GET)),
+        'parquet_available': PARQUET_AVAILABLE,
     }
     return render(request, 'core/production/list.html', context)
 
@@ -315,8 +337,12 @@ def production_create(request):
     if request.method == 'POST':
         form = DailyProductionForm(request.POST)
         if form.is_valid():
-            form.save()
-            messages.success(request, 'Production recorded successfully.')
+            production = form.save()
+            allocated = allocate_production(product_type_ids=[production.product_type_id])['units']
+            if allocated:
+                messages.success(request, f'Production recorded successfully. {allocated} unit(s) allocated to open orders.')
+            else:
+                messages.success(request, 'Production recorded successfully.')
 
             # Check if user wants to add another
             if request.POST.get('add_another'):
@@ -346,7 +372,11 @@ def production_delete(request, pk):
     if request.method == 'POST':
         product = production.product_type.name
         date = production.date
-        production.delete()
+        # Reopen the items it filled, then refill them from other production
+        with transaction.atomic():
+            released = release_allocations(production.allocations.all())
+            production.delete()
+            allocate_production(product_type_ids=released)
         messages.success(request, f'Production entry deleted.')
         return redirect('production_history')
 
@@ -361,7 +391,7 @@ def production_delete(request, pk):
 @login_required
 def customer_list(request):
     """List all customers"""
-    customers = Customer.objects.all().order_by('name')
+    customers = Customer.objects.with_order_stats().order_by('name')
     search = request.GET.get('search', '')
 
     if search:
@@ -370,6 +400,7 @@ def customer_list(request):
     context = {
         'customers': customers,
         'search': search,
+        'export_query': urlencode(EXPORT_REGISTRY['customers'].filters_from(request.GET)),
     }
     return render(request, 'core/customers/list.html', context)
 
@@ -475,15 +506,18 @@ def purchase_order_list(request):
         orders = orders.filter(created_at__date__lte=date_to)
 
     customers = Customer.objects.all().order_by('name')
+    page = paginate_keyset(orders, request, keys=('created_at', 'id'))
 
     context = {
-        'orders': orders,
+        'orders': page,
+        'page': page,
         'status': status,
         'customer_id': customer_id,
         'date_from': date_from,
         'date_to': date_to,
         'customers': customers,
         'status_choices': PurchaseOrder.STATUS_CHOICES,
+        'export_query': urlencode(EXPORT_REGISTRY['orders'].filters_from(request.GET)),
     }
     return render(request, 'core/orders/list.html', context)
 
@@ -499,6 +533,7 @@ def purchase_order_create(request):
             order = form.save()
             formset.instance = order
             formset.save()
+            allocate_production(product_type_ids=[item.product_type_id for item in order.items.all()])
             messages.success(request, 'Purchase order created successfully.')
             return redirect('purchase_order_detail', pk=order.pk)
     else:
@@ -521,6 +556,13 @@ def purchase_order_create(request):
     })
 
 
+@login_required
+def material_requirements(request):
+    """Raw materials needed to fill the open orders, per order date"""
+    context = compute_requirements()
+    return render(request, 'core/orders/requirements.html', context)
+
+
 @login_required
 def purchase_order_detail(request, pk):
     """View purchase order details"""
@@ -572,7 +614,15 @@ def purchase_order_change_status(request, pk):
         new_status = request.POST.get('status')
         if new_status in dict(PurchaseOrder.STATUS_CHOICES):
             order.status = new_status
-            order.save()
+            with transaction.atomic():
+                order.save()
+                # A cancelled order gives its units back to the next open orders;
+                # a reopened one can be filled from unallocated production
+                items = PurchaseOrderItem.objects.filter(purchase_order=order)
+                if new_status == 'cancelled':
+                    release_allocations(ProductionAllocation.objects.filter(order_item__in=items))
+                allocate_production(product_type_ids=set(items.values_list('product_type_id', flat=True)))
+                order.refresh_from_db(fields=['status'])
             messages.success(request, f'Order status changed to {order.get_status_display()}.')
             return redirect('purchase_order_detail', pk=order.pk)
 
@@ -589,7 +639,11 @@ def purchase_order_delete(request, pk):
 
     if request.method == 'POST':
         po_number = order.po_number
-        order.delete()
+        # Hand its allocated production to the next open orders
+        with transaction.atomic():
+            released = release_allocations(ProductionAllocation.objects.filter(order_item__purchase_order=order))
+            order.delete()
+            allocate_production(product_type_ids=released)
         messages.success(request, f'Order {po_number} deleted successfully.')
         return redirect('purchase_order_list')
 
@@ -601,365 +655,248 @@ def purchase_order_delete(request, pk):
 
 # ===== EXPORT VIEWS =====
 
-@login_required
-def export_raw_materials_excel(request):
-    """Export raw materials to Excel"""
-    materials = RawMaterial.objects.all().order_by('category', 'name')
-
-    data = []
-    for material in materials:
-        data.append({
-            'Name': material.name,
-            'Category': material.get_category_display(),
-            'Unit': material.unit,
-        })
-
-    export_data = {
-        'title': 'Raw Materials Library',
-        'sheet_name': 'Raw Materials',
-        'data': data,
-        'summary': {'Total Materials': len(data)}
-    }
-
-    headers = ['Name', 'Category', 'Unit']
-    excel_file = export_to_excel(export_data, headers)
-
-    response = HttpResponse(
-        excel_file.getvalue(),
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+def _csv_response(request, source, module_name, filters=None):
+    """Stream rows as CSV/TSV, serving unchanged data from the export cache"""
+    export_format = 'tsv' if request.GET.get('format') == 'tsv' else 'csv'
+    compress = request.GET.get('gzip') == '1'
+
+    content_type = 'text/tab-separated-values' if export_format == 'tsv' else 'text/csv'
+    filename = f'{get_export_filename(module_name, export_format)}.{export_format}'
+    if compress:
+        content_type = 'application/gzip'
+        filename += '.gz'
+
+    key = export_cache.cache_key(module_name, 'csv', {**(filters or {}), 'format': export_format, 'gzip': compress})
+    cached_path = export_cache.lookup(key, 'csv')
+    if cached_path:
+        return FileResponse(open(cached_path, 'rb'), as_attachment=True, filename=filename, content_type=content_type)
+
+    chunks = export_to_csv_stream(
+        source['rows'], source['headers'],
+        delimiter='\t' if export_format == 'tsv' else ',',
+        compress=compress,
     )
-    response['Content-Disposition'] = f'attachment; filename="{get_export_filename("raw_materials", "excel")}.xlsx"'
+    response = StreamingHttpResponse(export_cache.tee(key, 'csv', chunks), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
     return response
 
 
-@login_required
-def export_raw_materials_pdf(request):
-    """Export raw materials to PDF"""
-    materials = RawMaterial.objects.all().order_by('category', 'name')
-
-    data = []
-    for material in materials:
-        data.append({
-            'Name': material.name,
-            'Category': material.get_category_display(),
-            'Unit': material.unit,
-        })
-
-    export_data = {
-        'title': 'Raw Materials Library',
-        'data': data,
-        'summary': {'Total Materials': len(data)}
+def _busy_response(request, label, export_type=None, export_format=None):
+    """429 page offering a streamed CSV or a background export while every export slot is taken"""
+    spec = EXPORT_REGISTRY.get(export_type)
+    query = f'?{request.GET.urlencode()}' if request.GET else ''
+    context = {
+        'label': label,
+        'csv_url': f"{reverse('export_module', args=[export_type, 'csv'])}{query}" if spec and spec.supports('csv') else None,
+        'queue_url': f"{reverse('export_job_create', args=[export_type, export_format])}{query}" if spec else None,
     }
-
-    headers = ['Name', 'Category', 'Unit']
-    pdf_file = export_to_pdf(export_data, headers)
-
-    response = HttpResponse(pdf_file.getvalue(), content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="{get_export_filename("raw_materials", "pdf")}.pdf"'
+    response = render(request, 'core/exports/busy.html', context, status=429)
+    response['Retry-After'] = '30'
     return response
 
 
-@login_required
-def export_consumption_excel(request):
-    """Export consumption history to Excel"""
-    consumption = DailyConsumption.objects.all().select_related('raw_material').order_by('-date')
-
-    data = []
-    total_qty = 0
-    for record in consumption:
-        data.append({
-            'Date': record.date.strftime('%Y-%m-%d'),
-            'Material': record.raw_material.name,
-            'Category': record.raw_material.get_category_display(),
-            'Quantity': str(record.quantity),
-            'Unit': record.raw_material.unit,
-        })
-        total_qty += record.quantity
-
-    export_data = {
-        'title': 'Consumption History',
-        'sheet_name': 'Consumption',
-        'data': data,
-        'summary': {'Total Records': len(data), 'Date Range': f'{consumption.last().date if consumption else "N/A"} to {consumption.first().date if consumption else "N/A"}'}
-    }
-
-    headers = ['Date', 'Material', 'Category', 'Quantity', 'Unit']
-    excel_file = export_to_excel(export_data, headers)
-
-    response = HttpResponse(
-        excel_file.getvalue(),
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+def _file_response(request, source, module_name, export_format, filters=None):
+    """
+    Serve an Excel/PDF/Parquet export from the export cache, generating it on
+    a miss. Exports over the direct-download row limit are queued as
+    background exports; when every export slot is busy the user gets a 429.
+    """
+    key = export_cache.cache_key(module_name, export_format, filters)
+    path = export_cache.lookup(key, export_format)
+    if path is None:
+        rows = estimate_rows(source)
+        if rows > direct_row_limit(export_format):
+            job = enqueue_export(module_name, export_format, user=request.user, filters=filters)
+            messages.info(request, f'This export has {rows:,} rows, so it is being generated in the background.')
+            return redirect('export_job_detail', pk=job.pk)
+
+        try:
+            with heavy_export_slot():
+                path = export_cache.store(key, export_format, lambda output: write_export(source, export_format, output))
+        except ExportBusy:
+            return _busy_response(request, EXPORT_LABELS[module_name], module_name, export_format)
+
+    return FileResponse(
+        open(path, 'rb'),
+        as_attachment=True,
+        filename=f'{get_export_filename(module_name, export_format)}.{FILE_EXTENSIONS[export_format]}',
+        content_type=CONTENT_TYPES[export_format],
     )
-    response['Content-Disposition'] = f'attachment; filename="{get_export_filename("consumption", "excel")}.xlsx"'
-    return response
 
 
 @login_required
-def export_consumption_pdf(request):
-    """Export consumption history to PDF"""
-    consumption = DailyConsumption.objects.all().select_related('raw_material').order_by('-date')
-
-    data = []
-    for record in consumption:
-        data.append({
-            'Date': record.date.strftime('%Y-%m-%d'),
-            'Material': record.raw_material.name,
-            'Category': record.raw_material.get_category_display(),
-            'Quantity': str(record.quantity),
-            'Unit': record.raw_material.unit,
-        })
-
-    export_data = {
-        'title': 'Consumption History',
-        'data': data,
-        'summary': {'Total Records': len(data)}
-    }
-
-    headers = ['Date', 'Material', 'Category', 'Quantity', 'Unit']
-    pdf_file = export_to_pdf(export_data, headers)
+def export_module(request, export_type, export_format):
+    """
+    Export any registered module as Excel, PDF or CSV (TSV with ?format=tsv).
+    Accepts the same filter parameters as the module's list page.
+    """
+    spec = EXPORT_REGISTRY.get(export_type)
+    if spec is None or export_format not in FILE_EXTENSIONS or not spec.supports(export_format):
+        raise Http404('Unknown export')
+    if export_format == 'parquet' and not PARQUET_AVAILABLE:
+        messages.error(request, 'Parquet exports require the pyarrow package on the server.')
+        return redirect('export_job_list')
+
+    try:
+        filters = spec.filters_from(request.GET)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+    source = spec.source_for(export_format, filters)
+    if export_format == 'csv':
+        return _csv_response(request, source, export_type, filters)
+    return _file_response(request, source, export_type, export_format, filters)
+
+
+@login_required
+def export_full_workbook(request):
+    """Export every module to one Excel workbook read from a single consistent snapshot"""
+    key = export_cache.cache_key(WORKBOOK_EXPORT, 'excel', tables=WORKBOOK_TABLES)
+    path = export_cache.lookup(key, 'excel')
+    if path is None:
+        try:
+            with heavy_export_slot():
+                path = export_cache.store(key, 'excel', write_full_workbook)
+        except ExportBusy:
+            return _busy_response(request, 'Full Workbook')
+
+    return FileResponse(
+        open(path, 'rb'),
+        as_attachment=True,
+        filename=f'{get_export_filename(WORKBOOK_EXPORT, "excel")}.xlsx',
+        content_type=EXCEL_CONTENT_TYPE,
+    )
 
-    response = HttpResponse(pdf_file.getvalue(), content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="{get_export_filename("consumption", "pdf")}.pdf"'
-    return response
 
+# ===== BACKGROUND EXPORT VIEWS =====
 
 @login_required
-def export_products_excel(request):
-    """Export product types to Excel"""
-    products = ProductType.objects.all().order_by('name')
-
-    data = []
-    for product in products:
-        data.append({
-            'Name': product.name,
-            'Description': product.description or '',
-        })
+def export_job_list(request):
+    """List export modules and the current user's background export jobs"""
+    jobs = ExportJob.objects.filter(created_by=request.user).order_by('-created_at')[:20]
 
-    export_data = {
-        'title': 'Product Types',
-        'sheet_name': 'Products',
-        'data': data,
-        'summary': {'Total Products': len(data)}
+    context = {
+        'jobs': jobs,
+        'export_modules': [
+            (export_type, spec.label, [
+                (format_value, format_label)
+                for format_value, format_label in ExportJob.FORMAT_CHOICES
+                if spec.supports(format_value) and (format_value != 'parquet' or PARQUET_AVAILABLE)
+            ])
+            for export_type, spec in EXPORT_REGISTRY.items()
+        ],
     }
-
-    headers = ['Name', 'Description']
-    excel_file = export_to_excel(export_data, headers)
-
-    response = HttpResponse(
-        excel_file.getvalue(),
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
-    response['Content-Disposition'] = f'attachment; filename="{get_export_filename("products", "excel")}.xlsx"'
-    return response
+    return render(request, 'core/exports/list.html', context)
 
 
 @login_required
-def export_products_pdf(request):
-    """Export product types to PDF"""
-    products = ProductType.objects.all().order_by('name')
+def export_job_create(request, export_type, export_format):
+    """Queue a background export and return immediately"""
+    if request.method != 'POST':
+        return redirect('export_job_list')
 
-    data = []
-    for product in products:
-        data.append({
-            'Name': product.name,
-            'Description': product.description or '',
-        })
+    try:
+        job = enqueue_export(export_type, export_format, user=request.user, filters=request.GET)
+    except ValueError as e:
+        messages.error(request, str(e))
+        return redirect('export_job_list')
 
-    export_data = {
-        'title': 'Product Types',
-        'data': data,
-        'summary': {'Total Products': len(data)}
-    }
-
-    headers = ['Name', 'Description']
-    pdf_file = export_to_pdf(export_data, headers)
-
-    response = HttpResponse(pdf_file.getvalue(), content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="{get_export_filename("products", "pdf")}.pdf"'
-    return response
+    messages.success(request, 'Export queued. It will be ready to download shortly.')
+    return redirect('export_job_detail', pk=job.pk)
 
 
 @login_required
-def export_production_excel(request):
-    """Export production history to Excel"""
-    production = DailyProduction.objects.all().select_related('product_type').order_by('-date')
+def export_job_detail(request, pk):
+    """Show progress for a background export"""
+    job = get_object_or_404(ExportJob, pk=pk, created_by=request.user)
 
-    data = []
-    for record in production:
-        data.append({
-            'Date': record.date.strftime('%Y-%m-%d'),
-            'Product': record.product_type.name,
-            'Quantity': str(record.quantity),
-            'Contents': record.contents_description or '',
-        })
+    spec = EXPORT_REGISTRY.get(job.export_type)
 
-    export_data = {
-        'title': 'Production History',
-        'sheet_name': 'Production',
-        'data': data,
-        'summary': {'Total Records': len(data)}
+    context = {
+        'job': job,
+        'label': EXPORT_LABELS.get(job.export_type, job.export_type),
+        'filters': spec.describe_filters(job.filters) if spec else {},
     }
-
-    headers = ['Date', 'Product', 'Quantity', 'Contents']
-    excel_file = export_to_excel(export_data, headers)
-
-    response = HttpResponse(
-        excel_file.getvalue(),
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
-    response['Content-Disposition'] = f'attachment; filename="{get_export_filename("production", "excel")}.xlsx"'
-    return response
+    return render(request, 'core/exports/detail.html', context)
 
 
 @login_required
-def export_production_pdf(request):
-    """Export production history to PDF"""
-    production = DailyProduction.objects.all().select_related('product_type').order_by('-date')
+def export_job_download(request, pk):
+    """Download the file produced by a finished background export"""
+    job = get_object_or_404(ExportJob, pk=pk, created_by=request.user, status='done')
+    path = export_path(job)
 
-    data = []
-    for record in production:
-        data.append({
-            'Date': record.date.strftime('%Y-%m-%d'),
-            'Product': record.product_type.name,
-            'Quantity': str(record.quantity),
-            'Contents': record.contents_description or '',
-        })
+    if not path.exists():
+        messages.error(request, 'This export file is no longer available.')
+        return redirect('export_job_detail', pk=job.pk)
 
-    export_data = {
-        'title': 'Production History',
-        'data': data,
-        'summary': {'Total Records': len(data)}
-    }
-
-    headers = ['Date', 'Product', 'Quantity', 'Contents']
-    pdf_file = export_to_pdf(export_data, headers)
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=job.file_name)
 
-    response = HttpResponse(pdf_file.getvalue(), content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="{get_export_filename("production", "pdf")}.pdf"'
-    return response
 
+# ===== TRENDS & FORECAST VIEWS =====
 
 @login_required
-def export_customers_excel(request):
-    """Export customers to Excel"""
-    customers = Customer.objects.all().order_by('name')
+def trends(request):
+    """Consumption and production totals per day, week or month"""
+    series = request.GET.get('series')
+    if series not in TREND_SERIES:
+        series = 'material'
+    granularity = request.GET.get('granularity')
+    if granularity not in GRANULARITIES:
+        granularity = 'week'
 
-    data = []
-    for customer in customers:
-        order_count = customer.purchase_orders.count()
-        data.append({
-            'Name': customer.name,
-            'Contact': customer.contact_info or '',
-            'Orders': str(order_count),
-        })
+    try:
+        date_to = parse_date(request.GET.get('date_to') or '') or timezone.localdate()
+        date_from = parse_date(request.GET.get('date_from') or '') or date_to - timedelta(days=364)
+    except ValueError:
+        messages.error(request, 'Invalid date; showing the last 12 months.')
+        date_to = timezone.localdate()
+        date_from = date_to - timedelta(days=364)
 
-    export_data = {
-        'title': 'Customers',
-        'sheet_name': 'Customers',
-        'data': data,
-        'summary': {'Total Customers': len(data)}
+    context = {
+        'trend': get_trend(series, granularity, date_from, date_to),
+        'series': series,
+        'series_choices': [(value, spec.label) for value, spec in TREND_SERIES.items()],
+        'granularity': granularity,
+        'granularity_choices': [(value, label) for value, (label, _) in GRANULARITIES.items()],
+        'date_from': date_from.isoformat(),
+        'date_to': date_to.isoformat(),
     }
-
-    headers = ['Name', 'Contact', 'Orders']
-    excel_file = export_to_excel(export_data, headers)
-
-    response = HttpResponse(
-        excel_file.getvalue(),
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
-    response['Content-Disposition'] = f'attachment; filename="{get_export_filename("customers", "excel")}.xlsx"'
-    return response
+    return render(request, 'core/trends.html', context)
 
 
 @login_required
-def export_customers_pdf(request):
-    """Export customers to PDF"""
-    customers = Customer.objects.all().order_by('name')
-
-    data = []
-    for customer in customers:
-        order_count = customer.purchase_orders.count()
-        data.append({
-            'Name': customer.name,
-            'Contact': customer.contact_info or '',
-            'Orders': str(order_count),
-        })
-
-    export_data = {
-        'title': 'Customers',
-        'data': data,
-        'summary': {'Total Customers': len(data)}
+def material_forecast(request):
+    """Next week's expected usage of every raw material"""
+    context = {
+        **get_forecast(),
+        'history_weeks': HISTORY_DAYS // 7,
     }
+    return render(request, 'core/raw_materials/forecast.html', context)
 
-    headers = ['Name', 'Contact', 'Orders']
-    pdf_file = export_to_pdf(export_data, headers)
-
-    response = HttpResponse(pdf_file.getvalue(), content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="{get_export_filename("customers", "pdf")}.pdf"'
-    return response
 
+# ===== REPORT VIEWS =====
 
 @login_required
-def export_orders_excel(request):
-    """Export purchase orders to Excel"""
-    orders = PurchaseOrder.objects.all().select_related('customer').order_by('-created_at')
-
-    data = []
-    for order in orders:
-        item_count = order.items.count()
-        data.append({
-            'PO Number': order.po_number,
-            'Customer': order.customer.name,
-            'Status': order.get_status_display(),
-            'Items': str(item_count),
-            'Progress': f"{order.overall_progress:.0f}%",
-            'Created': order.created_at.strftime('%Y-%m-%d'),
-        })
-
-    export_data = {
-        'title': 'Purchase Orders',
-        'sheet_name': 'Orders',
-        'data': data,
-        'summary': {'Total Orders': len(data)}
+def report_list(request):
+    """List the pre-generated standard reports"""
+    context = {
+        'reports': list_reports(),
     }
-
-    headers = ['PO Number', 'Customer', 'Status', 'Items', 'Progress', 'Created']
-    excel_file = export_to_excel(export_data, headers)
-
-    response = HttpResponse(
-        excel_file.getvalue(),
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
-    response['Content-Disposition'] = f'attachment; filename="{get_export_filename("orders", "excel")}.xlsx"'
-    return response
+    return render(request, 'core/reports/list.html', context)
 
 
 @login_required
-def export_orders_pdf(request):
-    """Export purchase orders to PDF"""
-    orders = PurchaseOrder.objects.all().select_related('customer').order_by('-created_at')
+def report_download(request, file_name):
+    """Download a pre-generated report"""
+    entry = load_manifest().get(file_name)
+    path = reports_root() / file_name
+    if entry is None or not path.exists():
+        raise Http404('Report not found')
 
-    data = []
-    for order in orders:
-        item_count = order.items.count()
-        data.append({
-            'PO Number': order.po_number,
-            'Customer': order.customer.name,
-            'Status': order.get_status_display(),
-            'Items': str(item_count),
-            'Progress': f"{order.overall_progress:.0f}%",
-            'Created': order.created_at.strftime('%Y-%m-%d'),
-        })
-
-    export_data = {
-        'title': 'Purchase Orders',
-        'data': data,
-        'summary': {'Total Orders': len(data)}
-    }
-
-    headers = ['PO Number', 'Customer', 'Status', 'Items', 'Progress', 'Created']
-    pdf_file = export_to_pdf(export_data, headers)
-
-    response = HttpResponse(pdf_file.getvalue(), content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="{get_export_filename("orders", "pdf")}.pdf"'
-    return response
+    download_name = f"{entry['export_type']}_{entry['period']}_{entry['date_to']}.{path.suffix.lstrip('.')}"
+    return FileResponse(
+        open(path, 'rb'),
+        as_attachment=True,
+        filename=download_name,
+        content_type=CONTENT_TYPES[entry['export_format']],
+    )
@@ -111,6 +111,49 @@ else:
     }
 
 
+# Cache
+# Per-process memory cache; entries are short-lived so workers converge quickly
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'kitchen-management-system',
+    }
+}
+
+# Seconds a dashboard KPI snapshot may be served before it is recomputed
+DASHBOARD_CACHE_SECONDS = int(os.getenv('DASHBOARD_CACHE_SECONDS', '60'))
+# Seconds a computed trend may be served; new entries invalidate it sooner
+TRENDS_CACHE_SECONDS = int(os.getenv('TRENDS_CACHE_SECONDS', '600'))
+# Seconds the material forecast may be served; new consumption entries invalidate it sooner
+FORECAST_CACHE_SECONDS = int(os.getenv('FORECAST_CACHE_SECONDS', '600'))
+
+
+# Background exports
+# Generated files are written here by `manage.py run_export_worker` and removed after expiry
+
+EXPORT_ROOT = Path(os.getenv('EXPORT_ROOT', BASE_DIR / 'exports'))
+EXPORT_RETENTION_HOURS = int(os.getenv('EXPORT_RETENTION_HOURS', '24'))
+# Jobs still running after this long (worker killed mid-export) are failed when a worker starts
+EXPORT_JOB_TIMEOUT_MINUTES = int(os.getenv('EXPORT_JOB_TIMEOUT_MINUTES', '60'))
+# Background PDF exports of at least this many rows are rendered across EXPORT_PDF_WORKERS processes
+EXPORT_PDF_PARALLEL_MIN_ROWS = int(os.getenv('EXPORT_PDF_PARALLEL_MIN_ROWS', '20000'))
+EXPORT_PDF_WORKERS = int(os.getenv('EXPORT_PDF_WORKERS', str(os.cpu_count() or 1)))
+# Heavy (Excel/PDF/Parquet) downloads generated at once across all web workers; more get a 429
+EXPORT_MAX_CONCURRENT = int(os.getenv('EXPORT_MAX_CONCURRENT', '2'))
+# Larger direct downloads are queued as background exports instead
+EXPORT_DIRECT_MAX_ROWS = int(os.getenv('EXPORT_DIRECT_MAX_ROWS', '50000'))
+EXPORT_DIRECT_MAX_PDF_ROWS = int(os.getenv('EXPORT_DIRECT_MAX_PDF_ROWS', '10000'))
+
+# Direct downloads are cached on disk, keyed by a fingerprint of the data they read
+EXPORT_CACHE_ROOT = Path(os.getenv('EXPORT_CACHE_ROOT', EXPORT_ROOT / 'cache'))
+EXPORT_CACHE_MAX_MB = int(os.getenv('EXPORT_CACHE_MAX_MB', '200'))
+EXPORT_CACHE_MAX_AGE_HOURS = int(os.getenv('EXPORT_CACHE_MAX_AGE_HOURS', '24'))
+
+# Standard reports pre-rendered nightly by `manage.py generate_reports`
+REPORTS_ROOT = Path(os.getenv('REPORTS_ROOT', EXPORT_ROOT / 'reports'))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
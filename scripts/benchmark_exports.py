@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Export Micro-Benchmarks
+Times the export writers and the quotation builders on synthetic data and
+writes the results as JSON, so runs from two commits can be compared.
+
+Runs offline: no database or Django settings are needed.
+
+For every writer and row count it records wall time, peak Python memory
+(tracemalloc) and output size. Wall time comes from a run without
+tracemalloc; peak memory from a second, traced run.
+
+Usage:
+    python3 scripts/benchmark_exports.py                                  # 1k, 10k, 100k rows
+    python3 scripts/benchmark_exports.py --sizes 1000,10000 --output before.json
+    python3 scripts/benchmark_exports.py --writers excel_stream,pdf_stream
+    python3 scripts/benchmark_exports.py --output after.json --compare before.json
+"""
+
+import argparse
+import csv
+import io
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+from core.services import export  # noqa: E402
+
+# Constants
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_THRESHOLD = 1.25  # --compare flags results this many times slower or larger
+NOISE_SECONDS = 0.05  # Slowdowns smaller than this are timer noise, whatever the ratio
+SEED = 20240101
+
+HEADERS = ["Date", "Material", "Category", "Quantity", "Unit"]
+SCHEMA = [
+    ("date", "date", None),
+    ("material", "string", None),
+    ("category", "category", None),
+    ("quantity", "decimal", (10, 2)),
+    ("unit", "category", None),
+]
+MATERIALS = [
+    ("Chicken Breast", "Meat", "kg"),
+    ("Pork Belly", "Meat", "kg"),
+    ("Cooking Oil", "Oil", "liters"),
+    ("Garlic", "Vegetables", "heads"),
+    ("Onion", "Vegetables", "kg"),
+    ("Rice", "Grains", "kg"),
+    ("Styro Packs", "Miscellaneous", "pieces"),
+]
+QUOTATION_HEADER = {
+    "date": "1/15/2026",
+    "customer_name": "Benchmark Customer",
+    "customer_location": "Cebu City",
+    "attention": "Purchasing Officer",
+    "phone": "09170000000",
+    "installation_location": "Main Building",
+    "doc_type": "job",
+    "manager": "J.B Yap Jr.",
+    "warranty": "Ninety (90) days excluding compressor and all spare parts",
+    "payment": "Cash Upon Completion",
+    "exceptions": "(1) Circuit breaker and Gov't Fees (2) Power Supply",
+}
+TASKS_PER_ITEM = 5
+
+
+def synthetic_rows(count):
+    """Consumption-shaped rows: (date, material, category, quantity, unit), newest first."""
+    rng = random.Random(SEED)
+    start = date(2026, 1, 1)
+    for index in range(count):
+        name, category, unit = MATERIALS[rng.randrange(len(MATERIALS))]
+        quantity = Decimal(rng.randrange(1, 100000)) / 100
+        yield (start - timedelta(days=index // 50), name, category, quantity, unit)
+
+
+def synthetic_quotation_csv(count):
+    """Quotation CSV text with `count` task rows, TASKS_PER_ITEM per item."""
+    rng = random.Random(SEED)
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(QUOTATION_HEADER.keys())
+    writer.writerow(QUOTATION_HEADER.values())
+    output.write("\n[ITEMS]\n")
+    writer.writerow(["item_name", "ac_brand", "ac_model", "task_name", "task_cost", "quantity", "item_warranty"])
+    for index in range(count):
+        item = index // TASKS_PER_ITEM
+        writer.writerow([
+            f"Unit {item + 1} Installation", "Daikin", "1hp Inverter",
+            f"Task {index % TASKS_PER_ITEM + 1}", rng.randrange(0, 20000), rng.randrange(1, 4), "",
+        ])
+    return output.getvalue()
+
+
+def _summary():
+    return {"Total Records": "benchmark"}
+
+
+# Each case: prepare(rows) builds the input outside the measured region,
+# run(prepared) produces the output and returns its size in bytes.
+
+def _legacy_input(count):
+    return {
+        "title": "Consumption History",
+        "data": [dict(zip(HEADERS, row)) for row in synthetic_rows(count)],
+        "summary": _summary(),
+    }
+
+
+def _size(output):
+    output.seek(0, io.SEEK_END)
+    return output.tell()
+
+
+def run_excel_legacy(data):
+    return _size(export.export_to_excel(data, HEADERS))
+
+
+def run_excel_stream(count):
+    return _size(export.export_to_excel_stream(
+        synthetic_rows(count), HEADERS, title="Consumption History", summary=_summary, output=io.BytesIO()
+    ))
+
+
+def run_csv_stream(count):
+    return sum(len(chunk) for chunk in export.export_to_csv_stream(synthetic_rows(count), HEADERS))
+
+
+def run_pdf_legacy(data):
+    return _size(export.export_to_pdf(data, HEADERS))
+
+
+def run_pdf_stream(count):
+    return _size(export.export_to_pdf_stream(
+        synthetic_rows(count), HEADERS, title="Consumption History", summary=_summary, output=io.BytesIO()
+    ))
+
+
+def run_parquet(count):
+    return _size(export.export_to_parquet(synthetic_rows(count), SCHEMA, output=io.BytesIO()))
+
+
+def _quotation_csv_file(count):
+    path = Path(tempfile.gettempdir()) / f"benchmark_quotation_{count}.csv"
+    path.write_text(synthetic_quotation_csv(count))
+    return path
+
+
+def run_parse_csv(path):
+    import quotation_batch
+    quotation_batch.parse_csv(path)
+    return path.stat().st_size
+
+
+def _parsed_quotation(count):
+    import quotation_batch
+    return quotation_batch.parse_csv(_quotation_csv_file(count))
+
+
+def run_create_docx(parsed):
+    import quotation_batch
+    output = io.BytesIO()
+    quotation_batch.create_docx(*parsed).save(output)
+    return _size(output)
+
+
+# name: (prepare, run, largest row count run by default, available)
+CASES = {
+    "excel_legacy": (_legacy_input, run_excel_legacy, 10000, True),
+    "excel_stream": (int, run_excel_stream, None, True),
+    "csv_stream": (int, run_csv_stream, None, True),
+    "pdf_legacy": (_legacy_input, run_pdf_legacy, 1000, True),
+    "pdf_stream": (int, run_pdf_stream, None, True),
+    "parquet": (int, run_parquet, None, export.PARQUET_AVAILABLE),
+    "quotation_parse_csv": (_quotation_csv_file, run_parse_csv, None, True),
+    "quotation_create_docx": (_parsed_quotation, run_create_docx, 10000, True),
+}
+
+
+def measure(name, rows):
+    """Wall time from an untraced run, then peak memory from a traced run."""
+    prepare, run, _, _ = CASES[name]
+
+    prepared = prepare(rows)
+    started = time.perf_counter()
+    output_bytes = run(prepared)
+    wall_seconds = time.perf_counter() - started
+
+    prepared = prepare(rows)
+    tracemalloc.start()
+    run(prepared)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "writer": name,
+        "rows": rows,
+        "wall_seconds": round(wall_seconds, 4),
+        "peak_bytes": peak_bytes,
+        "output_bytes": output_bytes,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    """Print time and memory ratios against a baseline run; returns the regressed results."""
+    baseline = {
+        (result["writer"], result["rows"]): result
+        for result in json.loads(Path(baseline_path).read_text())["results"]
+        if "wall_seconds" in result
+    }
+    regressions = []
+    print(f"\n  Compared with {baseline_path}:", file=sys.stderr)
+    for result in results:
+        before = baseline.get((result["writer"], result["rows"]))
+        if before is None or "wall_seconds" not in result:
+            continue
+        time_ratio = result["wall_seconds"] / max(before["wall_seconds"], 1e-9)
+        memory_ratio = result["peak_bytes"] / max(before["peak_bytes"], 1)
+        slower = time_ratio > threshold and result["wall_seconds"] - before["wall_seconds"] > NOISE_SECONDS
+        regressed = slower or memory_ratio > threshold
+        marker = "✗" if regressed else "✓"
+        print(f"    {marker} {result['writer']:<24} {result['rows']:>7} rows   "
+              f"time x{time_ratio:.2f}   memory x{memory_ratio:.2f}", file=sys.stderr)
+        if regressed:
+            regressions.append(result)
+    return regressions
+
+
+def main():
+    """Main execution flow."""
+    parser = argparse.ArgumentParser(description="Benchmark the export writers and quotation builders.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Comma-separated row counts (default: 1000,10000,100000)")
+    parser.add_argument("--writers", help=f"Comma-separated subset of: {', '.join(CASES)}")
+    parser.add_argument("--all-sizes", action="store_true",
+                        help="Also run the legacy writers and docx builder above their default row limits")
+    parser.add_argument("--output", help="Write the JSON results to this file (default: stdout)")
+    parser.add_argument("--compare", help="Baseline JSON from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Ratio above which --compare reports a regression (default: 1.25)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    writers = args.writers.split(",") if args.writers else list(CASES)
+    unknown = [name for name in writers if name not in CASES]
+    if unknown:
+        parser.error(f"Unknown writers: {', '.join(unknown)}")
+
+    results = []
+    for name in writers:
+        _, _, max_rows, available = CASES[name]
+        for rows in sizes:
+            if not available:
+                results.append({"writer": name, "rows": rows, "skipped": "optional dependency not installed"})
+            elif max_rows and rows > max_rows and not args.all_sizes:
+                results.append({"writer": name, "rows": rows, "skipped": f"over {max_rows} rows (use --all-sizes)"})
+            else:
+                result = measure(name, rows)
+                results.append(result)
+                print(f"  ✓ {name:<24} {rows:>7} rows   {result['wall_seconds']:>8.3f}s   "
+                      f"peak {result['peak_bytes'] / 1048576:>7.1f} MB   "
+                      f"output {result['output_bytes'] / 1048576:>7.2f} MB", file=sys.stderr)
+
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()